@@ -0,0 +1,365 @@
+import glob
+import importlib.util
+import os
+import sys
+import threading
+import time
+from collections import deque
+import numpy as np
+
+
+class ActuatorBackend:
+    """Base class for output devices driven by the ActuatorService.
+
+    open() and close() run on the writer thread, so backends can keep
+    connections and handles that are tied to that thread. write() receives
+    a level in percent and is only ever called between open() and close().
+    """
+    name = None
+
+    def open(self):
+        pass
+
+    def write(self, level):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ScreenBrightness(ActuatorBackend):
+    """Screen brightness through screen_brightness_control, in percent"""
+    name = "brightness"
+
+    def open(self):
+        import screen_brightness_control as sbc
+        self.sbc = sbc
+
+    def write(self, level):
+        self.sbc.set_brightness(int(level))
+
+    def close(self):
+        pass
+
+
+class WindowsVolume(ActuatorBackend):
+    """Master volume through the Windows audio endpoint API, in percent"""
+    name = "volume"
+
+    def open(self):
+        # COM objects must be created on the thread that uses them
+        import comtypes
+        from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+        from ctypes import cast, POINTER
+        from comtypes import CLSCTX_ALL
+
+        comtypes.CoInitialize()
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        self.volume = cast(interface, POINTER(IAudioEndpointVolume))
+        self.minVol, self.maxVol, _ = self.volume.GetVolumeRange()
+
+    def write(self, percent):
+        vol = np.interp(percent, [0, 100], [self.minVol, self.maxVol])
+        self.volume.SetMasterVolumeLevel(vol, None)
+
+    def close(self):
+        import comtypes
+        self.volume = None
+        comtypes.CoUninitialize()
+
+
+class SysfsBacklight(ActuatorBackend):
+    """Linux backlight written straight to /sys/class/backlight, in percent.
+
+    The brightness file stays open for the lifetime of the writer, so each
+    change is a single write() system call. The user needs write access to
+    the file (usually through a udev rule or the video group).
+    """
+    name = "brightness"
+
+    def __init__(self, device=None):
+        self.device = device
+        self.fd = None
+
+    @staticmethod
+    def devices():
+        return sorted(glob.glob("/sys/class/backlight/*"))
+
+    def open(self):
+        devices = [self.device] if self.device else self.devices()
+        if not devices:
+            raise IOError("No backlight found in /sys/class/backlight")
+        with open(os.path.join(devices[0], "max_brightness")) as f:
+            self.max_brightness = int(f.read())
+        self.fd = os.open(os.path.join(devices[0], "brightness"), os.O_WRONLY)
+
+    def write(self, level):
+        value = round(self.max_brightness * min(max(level, 0), 100) / 100)
+        os.pwrite(self.fd, str(value).encode(), 0)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class PulseAudioVolume(ActuatorBackend):
+    """Default PulseAudio (or PipeWire) sink volume over one pulsectl connection, in percent"""
+    name = "volume"
+
+    def open(self):
+        import pulsectl
+        self.pulse = pulsectl.Pulse("hand-gesture-control")
+        self.sink = self.pulse.get_sink_by_name(self.pulse.server_info().default_sink_name)
+
+    def write(self, percent):
+        self.pulse.volume_set_all_chans(self.sink, min(max(percent, 0), 100) / 100)
+
+    def close(self):
+        self.pulse.close()
+
+
+class AlsaVolume(ActuatorBackend):
+    """ALSA mixer volume through one open pyalsaaudio mixer handle, in percent"""
+    name = "volume"
+
+    def __init__(self, control="Master"):
+        self.control = control
+
+    def open(self):
+        import alsaaudio
+        self.mixer = alsaaudio.Mixer(self.control)
+
+    def write(self, percent):
+        self.mixer.setvolume(int(min(max(percent, 0), 100)))
+
+    def close(self):
+        self.mixer.close()
+
+
+class RecordingActuator(ActuatorBackend):
+    """Device stand-in that records every write, for tests and load runs without hardware"""
+    def __init__(self, name, write_delay=0.0, history=10000):
+        self.name = name
+        # Optionally simulate a slow device
+        self.write_delay = write_delay
+        self.values = deque(maxlen=history)
+
+    def write(self, level):
+        if self.write_delay:
+            time.sleep(self.write_delay)
+        self.values.append((time.perf_counter(), level))
+
+
+class Actuator:
+    """Write state and statistics for one output device"""
+    def __init__(self, device, deadband, min_interval):
+        self.device = device
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.available = True
+        self.pending = None
+        self.current = None
+        self.last_write = 0
+
+        # Statistics
+        self.writes = 0
+        self.failures = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_error = None
+        self.latencies = deque(maxlen=256)
+
+    def within_deadband(self, value):
+        return self.current is not None and abs(value - self.current) <= self.deadband
+
+    def apply(self, value):
+        """Write one value to the device (runs on the actuator thread)"""
+        start = time.perf_counter()
+        try:
+            self.device.write(value)
+        except Exception as e:
+            self.failures += 1
+            if self.last_error is None:
+                print(f"Error setting {self.device.name}: {e}")
+            self.last_error = str(e)
+        else:
+            self.current = value
+            self.writes += 1
+        end = time.perf_counter()
+        self.last_write = end
+        self.latencies.append(end - start)
+
+    def stats(self):
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            "writes": self.writes,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "mean_ms": float(latencies.mean()),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "max_ms": float(latencies.max()),
+            "last_error": self.last_error,
+        }
+
+
+class ActuatorService(threading.Thread):
+    """Background writer that applies only the latest target value of each device.
+
+    set_target() never blocks on hardware. Targets within the device's deadband
+    of the last written value are dropped, newer targets replace ones not yet
+    written, and each device is written at most once per min_interval.
+    """
+    def __init__(self):
+        super().__init__(name="actuators", daemon=True)
+        self.actuators = {}
+        self.cond = threading.Condition()
+        self.stopping = False
+        # Set once every device has been opened (or failed to open)
+        self.ready = threading.Event()
+
+    def add(self, device, deadband=0.0, min_interval=0.0):
+        self.actuators[device.name] = Actuator(device, deadband, min_interval)
+
+    def set_target(self, name, value):
+        """Request a new value for a device without waiting for it to be written"""
+        with self.cond:
+            actuator = self.actuators.get(name)
+            if actuator is None or not actuator.available:
+                return
+            if actuator.pending is None and actuator.within_deadband(value):
+                actuator.dropped += 1
+                return
+            if actuator.pending is not None:
+                actuator.coalesced += 1
+            actuator.pending = value
+            self.cond.notify()
+
+    def queue_depth(self):
+        """Number of devices with a target waiting to be written"""
+        return sum(actuator.pending is not None for actuator in self.actuators.values())
+
+    def due_actuators(self):
+        """Return actuators ready to write now and how long until the next one is"""
+        now = time.perf_counter()
+        due = []
+        wait = None
+        for actuator in self.actuators.values():
+            if actuator.pending is None:
+                continue
+            if actuator.within_deadband(actuator.pending):
+                actuator.dropped += 1
+                actuator.pending = None
+                continue
+            remaining = actuator.last_write + actuator.min_interval - now
+            if remaining <= 0 or self.stopping:
+                due.append(actuator)
+            elif wait is None or remaining < wait:
+                wait = remaining
+        return due, wait
+
+    def run(self):
+        for actuator in self.actuators.values():
+            try:
+                actuator.device.open()
+            except Exception as e:
+                actuator.available = False
+                actuator.last_error = str(e)
+                print(f"Could not open {actuator.device.name} control: {e}")
+        self.ready.set()
+
+        while True:
+            with self.cond:
+                due, wait = self.due_actuators()
+                while not due and not self.stopping:
+                    self.cond.wait(wait)
+                    due, wait = self.due_actuators()
+                if not due and self.stopping:
+                    break
+                jobs = []
+                for actuator in due:
+                    jobs.append((actuator, actuator.pending))
+                    actuator.pending = None
+
+            # Hardware writes happen outside the lock so callers never wait on them
+            for actuator, value in jobs:
+                actuator.apply(value)
+
+        for actuator in self.actuators.values():
+            if actuator.available:
+                try:
+                    actuator.device.close()
+                except Exception as e:
+                    print(f"Error closing {actuator.device.name} control: {e}")
+
+    def stats(self):
+        """Write latency and failure counts per device"""
+        return {name: actuator.stats() for name, actuator in self.actuators.items()}
+
+    def stop(self, timeout=1.0):
+        """Write any pending targets, then stop the thread"""
+        with self.cond:
+            self.stopping = True
+            self.cond.notify()
+        if self.is_alive():
+            self.join(timeout)
+
+
+def default_brightness_backend():
+    if sys.platform.startswith("linux") and SysfsBacklight.devices():
+        return "sysfs"
+    return "sbc"
+
+
+def default_volume_backend():
+    if sys.platform == "win32":
+        return "pycaw"
+    if importlib.util.find_spec("pulsectl") is not None:
+        return "pulse"
+    if importlib.util.find_spec("alsaaudio") is not None:
+        return "alsa"
+    print("No volume backend found (install pulsectl or pyalsaaudio), volume changes are only recorded")
+    return "mock"
+
+
+BRIGHTNESS_BACKENDS = {
+    "sbc": ScreenBrightness,
+    "sysfs": SysfsBacklight,
+    "mock": lambda: RecordingActuator("brightness"),
+}
+
+VOLUME_BACKENDS = {
+    "pycaw": WindowsVolume,
+    "pulse": PulseAudioVolume,
+    "alsa": AlsaVolume,
+    "mock": lambda: RecordingActuator("volume"),
+}
+
+# Minimum seconds between writes; native backends are cheap enough to follow the hand closely
+WRITE_INTERVALS = {"sbc": 0.1, "pycaw": 0.02}
+
+
+def create_actuator_service(brightness="auto", volume="auto"):
+    """Start the background writer for screen brightness and system volume.
+
+    Each backend is picked by name from BRIGHTNESS_BACKENDS / VOLUME_BACKENDS,
+    or for "auto" by what the platform supports.
+    """
+    if brightness == "auto":
+        brightness = default_brightness_backend()
+    if volume == "auto":
+        volume = default_volume_backend()
+    if brightness not in BRIGHTNESS_BACKENDS:
+        raise ValueError(f"Unknown brightness backend: {brightness}")
+    if volume not in VOLUME_BACKENDS:
+        raise ValueError(f"Unknown volume backend: {volume}")
+
+    service = ActuatorService()
+    # screen_brightness_control writes are slow, so they are rate limited harder than volume
+    service.add(BRIGHTNESS_BACKENDS[brightness](), deadband=0,
+                min_interval=WRITE_INTERVALS.get(brightness, 0.02))
+    service.add(VOLUME_BACKENDS[volume](), deadband=0.5, min_interval=WRITE_INTERVALS.get(volume, 0.01))
+    service.start()
+    return service
@@ -0,0 +1,180 @@
+"""Run the gesture pipeline over a directory of recorded videos on all CPU cores.
+
+Usage:
+    python batch_process.py sessions/ --output results/ [--workers 8]
+
+Each video is processed by a worker process with its own hand-tracking
+instance. Per video, the output directory gets:
+    NAME.events.csv    gesture events with their video time
+    NAME.controls.csv  brightness/volume timeline, one row per frame
+    NAME.lmk           landmark recording (see landmark_recording.py)
+Rows are written as frames are processed, so memory use does not grow with
+video length. summary.json lists every video and the throughput per worker.
+A video that cannot be read is listed with its error under "failed" and
+does not stop the rest of the batch.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+
+
+def find_videos(directory):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(VIDEO_EXTENSIONS))
+
+
+def process_video(job):
+    """Worker: process one video; a video that fails yields an entry with its error instead of raising"""
+    path = job[0]
+    start = time.perf_counter()
+    try:
+        return run_video(*job)
+    except Exception as e:
+        elapsed = time.perf_counter() - start
+        return {
+            "video": path,
+            "error": f"{type(e).__name__}: {e}",
+            "frames": 0,
+            "events": 0,
+            "seconds": elapsed,
+            "fps": 0,
+            "worker": os.getpid(),
+        }
+
+
+def run_video(path, output_dir, options):
+    """Run one video through HandControlCore and stream its outputs to disk"""
+    from frame_sources import VideoFileSource
+    from hand_control import HandControlCore
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    prefix = os.path.join(output_dir, name)
+    source = VideoFileSource(path)
+    try:
+        frame_period = 1.0 / source.fps()
+        core = HandControlCore(apply_controls=False, drawing=False,
+                               landmark_filter=options.get("landmark_filter", "one_euro"),
+                               record_landmarks=prefix + ".lmk" if options.get("landmarks", True) else None)
+    except Exception:
+        source.release()
+        raise
+    frames = 0
+    events = 0
+    start = time.perf_counter()
+    try:
+        with open(prefix + ".events.csv", "w", newline="") as events_file, \
+                open(prefix + ".controls.csv", "w", newline="") as controls_file:
+            events_writer = csv.writer(events_file)
+            controls_writer = csv.writer(controls_file)
+            events_writer.writerow(["frame", "time", "event"])
+            controls_writer.writerow(["frame", "time", "brightness", "volume", "brightness_frozen",
+                                      "volume_frozen", "left_hand", "right_hand"])
+            while True:
+                ret, frame = source.read()
+                if not ret:
+                    break
+                # Video time instead of wall time keeps gesture timing identical to the recording
+                video_time = frames * frame_period
+                result = core.process_frame(frame, video_time, annotate=False)
+                source.recycle(frame)
+                result.release()
+                controls_writer.writerow([frames, f"{video_time:.3f}", result.brightness_value, result.volume_value,
+                                          int(result.brightness_frozen), int(result.volume_frozen),
+                                          int(result.left_hand_detected), int(result.right_hand_detected)])
+                for message, _ in result.events:
+                    events_writer.writerow([frames, f"{video_time:.3f}", message])
+                    events += 1
+                frames += 1
+    finally:
+        source.release()
+        core.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "video": path,
+        "frames": frames,
+        "events": events,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0,
+        "worker": os.getpid(),
+    }
+
+
+def summarize_workers(results):
+    """Frames, busy time and frames/sec for each worker process"""
+    workers = {}
+    for result in results:
+        if "error" in result:
+            continue
+        worker = workers.setdefault(result["worker"], {"videos": 0, "frames": 0, "seconds": 0.0})
+        worker["videos"] += 1
+        worker["frames"] += result["frames"]
+        worker["seconds"] += result["seconds"]
+    for worker in workers.values():
+        worker["fps"] = worker["frames"] / worker["seconds"] if worker["seconds"] > 0 else 0
+    return workers
+
+
+def run_batch(video_dir, output_dir, workers=None, options=None):
+    """Process every video in video_dir; returns the summary written to summary.json"""
+    videos = find_videos(video_dir)
+    if not videos:
+        raise IOError(f"No videos found in: {video_dir}")
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count()
+    jobs = [(path, output_dir, options or {}) for path in videos]
+
+    results = []
+    start = time.perf_counter()
+    with multiprocessing.Pool(min(workers, len(jobs))) as pool:
+        # Results arrive as each video finishes, not when the whole batch is done
+        for result in pool.imap_unordered(process_video, jobs):
+            results.append(result)
+            if "error" in result:
+                print(f"[{len(results)}/{len(jobs)}] {os.path.basename(result['video'])}: "
+                      f"FAILED ({result['error']})", flush=True)
+                continue
+            print(f"[{len(results)}/{len(jobs)}] {os.path.basename(result['video'])}: "
+                  f"{result['frames']} frames, {result['events']} events, {result['fps']:.1f} fps", flush=True)
+    elapsed = time.perf_counter() - start
+
+    total_frames = sum(result["frames"] for result in results)
+    summary = {
+        "videos": sorted(results, key=lambda result: result["video"]),
+        "failed": sorted(result["video"] for result in results if "error" in result),
+        "workers": summarize_workers(results),
+        "frames": total_frames,
+        "seconds": elapsed,
+        "fps": total_frames / elapsed if elapsed > 0 else 0,
+    }
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch gesture processing of recorded videos")
+    parser.add_argument("video_dir")
+    parser.add_argument("--output", default="batch_output", help="directory for the per-video outputs")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--landmark-filter", choices=["one_euro", "kalman", "none"], default="one_euro")
+    parser.add_argument("--no-landmarks", action="store_true", help="skip the landmark recordings")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.video_dir, args.output, args.workers,
+                        {"landmark_filter": args.landmark_filter, "landmarks": not args.no_landmarks})
+    print(f"Processed {summary['frames']} frames from {len(summary['videos']) - len(summary['failed'])} videos in "
+          f"{summary['seconds']:.1f}s ({summary['fps']:.1f} fps overall)")
+    if summary["failed"]:
+        print(f"{len(summary['failed'])} videos failed: {', '.join(summary['failed'])}")
+    for pid, worker in summary["workers"].items():
+        print(f"  worker {pid}: {worker['videos']} videos, {worker['frames']} frames, {worker['fps']:.1f} fps")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""Per-stage benchmark of the frame loop over recorded fixture clips.
+
+Usage:
+    python benchmark_stages.py clip1.mp4 frames_dir/ --output bench.json
+    python benchmark_stages.py --compare baseline.json --output bench.json
+
+Without clips a synthetic source is used. Each stage reports p50/p95/p99
+latency, throughput and peak bytes allocated per call, and the results are
+written as JSON so builds can be compared.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from frame_sources import SyntheticSource, open_source
+from hand_control import FrameResult, HandControlCore
+from hand_features import GESTURES, HandFeatures, landmarks_to_array
+
+
+class StageStats:
+    """Collects latency and allocation samples for named stages"""
+    def __init__(self):
+        self.times = {}
+        self.allocations = {}
+        self.track_allocations = False
+
+    def run(self, name, fn, *args):
+        """Time one call of fn and record it under the stage name"""
+        if self.track_allocations:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = fn(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            self.allocations.setdefault(name, []).append(max(peak - before, 0))
+            return result
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        self.times.setdefault(name, []).append(time.perf_counter_ns() - start)
+        return result
+
+    def report(self):
+        stages = {}
+        for name, samples in self.times.items():
+            ms = np.array(samples, dtype=np.float64) / 1e6
+            allocs = self.allocations.get(name, [])
+            stages[name] = {
+                "calls": len(samples),
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "p99_ms": float(np.percentile(ms, 99)),
+                "throughput_per_s": float(1000.0 / ms.mean()) if ms.mean() > 0 else 0.0,
+                "alloc_bytes_per_call": float(np.mean(allocs)) if allocs else None,
+            }
+        return stages
+
+
+class FrameLoopBenchmark:
+    """Runs the stages of the frame loop one by one, the way the app chains them"""
+    def __init__(self, display_size=(1200, 900), use_tk=True):
+        self.core = HandControlCore(apply_controls=False)
+        self.renderer = None
+        self.tk_root = None
+        try:
+            from display import DisplayRenderer
+            self.renderer = DisplayRenderer()
+            self.renderer.set_target_size(*display_size)
+        except ImportError as e:
+            print(f"Display dependencies not installed, skipping display stages: {e}")
+        if use_tk and self.renderer is not None:
+            try:
+                import tkinter as tk
+                self.tk_root = tk.Tk()
+                self.tk_root.withdraw()
+            except Exception as e:
+                print(f"No Tk display available, skipping PhotoImage stage: {e}")
+
+    def run_stages(self, stats, raw):
+        """Run every stage of one iteration separately, into the same reused buffers as the app"""
+        result = FrameResult(None, time.perf_counter())
+        try:
+            self.run_stages_into(stats, raw, result)
+        finally:
+            result.release()
+
+    def run_stages_into(self, stats, raw, result):
+        core = self.core
+        # Same path as HandControlCore.to_rgb: flip into the scratch buffer, convert into a pooled one
+        if core.flip_buffer is None or core.flip_buffer.shape != raw.shape:
+            core.flip_buffer = np.empty_like(raw)
+        flipped = stats.run("flip", cv2.flip, raw, 1, core.flip_buffer)
+        frame = core.frame_pool.acquire(raw.shape)
+        result.own(core.frame_pool, frame)
+        stats.run("cvtColor", cv2.cvtColor, flipped, cv2.COLOR_BGR2RGB, frame)
+        processed = stats.run("hands_process", core.hands.process, frame)
+
+        hands = processed.multi_hand_landmarks or []
+        for landmarks in hands:
+            stats.run("draw_landmarks", core.draw.draw_landmarks, frame, landmarks,
+                      core.mpHands.HAND_CONNECTIONS, core.landmark_style, core.connection_style)
+
+        height, width, _ = frame.shape
+        arrays = [stats.run("landmarks_to_array", landmarks_to_array, landmarks) for landmarks in hands]
+        features = stats.run("hand_features", HandFeatures.from_hands, arrays, (width, height))
+        stats.run("gesture_eval", GESTURES.evaluate, features)
+        for points in features.points:
+            stats.run("pinch_overlay", core.draw_pinch, frame, points)
+
+        if self.renderer is None:
+            return
+        # Same path as DisplayRenderer.render: pooled resize target and PIL image
+        size = self.renderer.fit_size(width, height)
+        display = frame
+        if size != (width, height):
+            display = self.renderer.array_pool.acquire((size[1], size[0], 3))
+            result.own(self.renderer.array_pool, display)
+            stats.run("display_resize", cv2.resize, frame, size, display, 0, 0, self.renderer.interpolation)
+        image = self.renderer.image_pool.acquire(size)
+        result.own(self.renderer.image_pool, image)
+        stats.run("pil_frombytes", image.frombytes, display)
+        if self.tk_root is not None:
+            stats.run("photo_update", self.renderer.update_photo, image)
+
+    def run_end_to_end(self, stats, raw):
+        """Run one full iteration the way the app does"""
+        def iteration(raw):
+            result = self.core.process_frame(raw)
+            if self.renderer is not None:
+                self.renderer.render(result)
+                if self.tk_root is not None:
+                    self.renderer.update_photo(result.display_image)
+            # Hand the pooled buffers back, as the UI does after showing a frame
+            result.release()
+        stats.run("end_to_end", iteration, raw)
+
+    def close(self):
+        self.core.close()
+        if self.tk_root is not None:
+            self.tk_root.destroy()
+
+
+def load_frames(spec, max_frames):
+    """Decode a fixture clip fully up front so decoding is not part of the timings"""
+    source = SyntheticSource(frame_count=max_frames) if spec == "synthetic" else open_source(spec)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = source.read()
+        if not ret:
+            if source.exhausted:
+                break
+            continue
+        frames.append(frame)
+    source.release()
+    return frames
+
+
+def benchmark_clip(bench, frames, warmup):
+    stats = StageStats()
+    for frame in frames[:warmup]:
+        bench.run_stages(StageStats(), frame)
+
+    for frame in frames:
+        bench.run_stages(stats, frame)
+    for frame in frames:
+        bench.run_end_to_end(stats, frame)
+
+    # Allocations are measured in a separate pass so tracing does not skew latency
+    tracemalloc.start()
+    stats.track_allocations = True
+    for frame in frames:
+        bench.run_stages(stats, frame)
+        bench.run_end_to_end(stats, frame)
+    tracemalloc.stop()
+    return stats.report()
+
+
+def compare(report, baseline, threshold):
+    """Return the stages whose p95 latency grew by more than threshold"""
+    regressions = []
+    for clip, stages in report["clips"].items():
+        base_stages = baseline.get("clips", {}).get(clip, {})
+        for name, result in stages.items():
+            base = base_stages.get(name)
+            if base is None or base["p95_ms"] <= 0:
+                continue
+            change = result["p95_ms"] / base["p95_ms"] - 1
+            if change > threshold:
+                regressions.append((clip, name, base["p95_ms"], result["p95_ms"], change))
+    return regressions
+
+
+def print_report(report):
+    for clip, stages in report["clips"].items():
+        print(f"\n{clip}")
+        print(f"  {'stage':<22}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'per s':>10}{'alloc KB':>10}")
+        for name, s in stages.items():
+            alloc = "-" if s["alloc_bytes_per_call"] is None else f"{s['alloc_bytes_per_call'] / 1024:.1f}"
+            print(f"  {name:<22}{s['calls']:>7}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}"
+                  f"{s['p99_ms']:>10.3f}{s['throughput_per_s']:>10.1f}{alloc:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the hand control frame loop")
+    parser.add_argument("clips", nargs="*", default=["synthetic"],
+                        help="video files or image directories to use as fixtures (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=300, help="maximum frames per clip")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed frames before measuring")
+    parser.add_argument("--no-tk", action="store_true", help="skip the ImageTk.PhotoImage stage")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed p95 slowdown against the baseline (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    bench = FrameLoopBenchmark(use_tk=not args.no_tk)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "opencv": cv2.__version__,
+        "clips": {},
+    }
+    try:
+        for clip in args.clips:
+            frames = load_frames(clip, args.frames)
+            if not frames:
+                print(f"No frames in {clip}, skipping")
+                continue
+            report["clips"][clip] = benchmark_clip(bench, frames, args.warmup)
+    finally:
+        bench.close()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for clip, name, before, after, change in regressions:
+            print(f"REGRESSION {clip} {name}: p95 {before:.3f} ms -> {after:.3f} ms (+{change:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
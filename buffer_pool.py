@@ -0,0 +1,46 @@
+import threading
+import numpy as np
+
+
+class BufferPool:
+    """Reusable buffers handed between pipeline stages by reference.
+
+    A stage that acquires a buffer owns it until it either passes it on
+    (the receiver then owns it) or releases it back to the pool. Buffers
+    are grouped by key (for example shape), and a new one is only created
+    when no free buffer with that key is left, so after warm-up the pool
+    holds exactly as many buffers as are in flight. A buffer that is never
+    released is simply garbage collected; the pool then allocates a
+    replacement, which shows up in the `allocated` count.
+    """
+    def __init__(self, factory, key):
+        self.factory = factory
+        self.key = key
+        self.free = {}
+        self.lock = threading.Lock()
+
+        # Statistics
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, key):
+        with self.lock:
+            buffers = self.free.get(key)
+            if buffers:
+                self.reused += 1
+                return buffers.pop()
+            self.allocated += 1
+        return self.factory(key)
+
+    def release(self, buffer):
+        with self.lock:
+            self.free.setdefault(self.key(buffer), []).append(buffer)
+
+    def stats(self):
+        return {"allocated": self.allocated, "reused": self.reused}
+
+
+class ArrayPool(BufferPool):
+    """Pool of uint8 NumPy arrays keyed by shape"""
+    def __init__(self):
+        super().__init__(lambda shape: np.empty(shape, dtype=np.uint8), lambda array: array.shape)
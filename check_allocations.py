@@ -0,0 +1,86 @@
+"""Check that the per-frame path allocates (almost) nothing once warmed up.
+
+Usage:
+    python check_allocations.py [--frames 300] [--limit 65536]
+
+Synthetic frames run through capture, HandControlCore.process_frame and,
+when Pillow is installed, the preview renderer, with every buffer handed
+back the way the live pipeline does. tracemalloc (which also sees NumPy
+arrays) measures the peak bytes allocated while each frame is processed.
+The script exits with status 1 if the median exceeds --limit. A single
+640x480 frame is about 900 KB, so any per-frame frame copy fails it.
+"""
+import argparse
+import sys
+import tracemalloc
+import numpy as np
+from frame_sources import SyntheticSource
+from hand_control import HandControlCore
+
+
+def run_frame(source, core, renderer):
+    ret, frame = source.read()
+    result = core.process_frame(frame)
+    source.recycle(frame)
+    if renderer is not None:
+        renderer.render(result)
+    result.release()
+
+
+def measure(frames=300, warmup=30, annotate_preview=True):
+    """Peak bytes allocated per frame after warm-up"""
+    source = SyntheticSource(frame_count=0)
+    core = HandControlCore(apply_controls=False)
+    renderer = None
+    if annotate_preview:
+        try:
+            from display import DisplayRenderer
+            renderer = DisplayRenderer()
+        except ImportError:
+            print("Pillow not installed, skipping the preview renderer")
+
+    try:
+        for _ in range(warmup):
+            run_frame(source, core, renderer)
+
+        peaks = np.zeros(frames)
+        tracemalloc.start()
+        for i in range(frames):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            run_frame(source, core, renderer)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks[i] = peak - before
+        tracemalloc.stop()
+    finally:
+        core.close()
+
+    pools = {"capture": source.pool.stats(), "rgb": core.frame_pool.stats()}
+    if renderer is not None:
+        pools["resize"] = renderer.array_pool.stats()
+        pools["image"] = renderer.image_pool.stats()
+    return peaks, pools
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure steady-state allocations per frame")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=64 * 1024, help="maximum median bytes per frame")
+    parser.add_argument("--no-preview", action="store_true", help="leave out the preview renderer")
+    args = parser.parse_args(argv)
+
+    peaks, pools = measure(args.frames, args.warmup, not args.no_preview)
+    median = float(np.median(peaks))
+    print(f"Peak allocation per frame: median {median / 1024:.1f} KiB, "
+          f"p95 {np.percentile(peaks, 95) / 1024:.1f} KiB, max {peaks.max() / 1024:.1f} KiB")
+    for name, stats in pools.items():
+        print(f"  {name} pool: {stats['allocated']} buffers allocated, {stats['reused']} reuses")
+    if median > args.limit:
+        print(f"FAIL: more than {args.limit} bytes per frame")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
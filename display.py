@@ -0,0 +1,69 @@
+import time
+import cv2
+from PIL import Image, ImageTk
+from buffer_pool import ArrayPool, BufferPool
+
+
+class DisplayRenderer:
+    """Turns processed RGB frames into preview images sized for the video widget"""
+    def __init__(self, max_fps=0, interpolation=cv2.INTER_LINEAR):
+        # max_fps caps the preview rate only; processing keeps running at full speed
+        self.max_fps = max_fps
+        self.interpolation = interpolation
+        self.target_size = (640, 480)
+        self.last_render = 0
+        self.skipped = 0
+        self.photo = None
+        self.photo_size = None
+        # Resized frames and PIL images are reused; results own them until released
+        self.array_pool = ArrayPool()
+        self.image_pool = BufferPool(lambda size: Image.new("RGB", size), lambda image: image.size)
+
+    def set_target_size(self, width, height):
+        """Record the space available in the video widget (called on the Tk thread)"""
+        if width > 1 and height > 1:
+            self.target_size = (width, height)
+
+    def fit_size(self, frame_width, frame_height):
+        """Largest size that fits the widget while keeping the frame's aspect ratio"""
+        target_width, target_height = self.target_size
+        scale = min(target_width / frame_width, target_height / frame_height)
+        return max(int(frame_width * scale), 1), max(int(frame_height * scale), 1)
+
+    def render(self, result):
+        """Resize the annotated RGB frame once for display (runs on the render thread)"""
+        now = time.perf_counter()
+        if self.max_fps and now - self.last_render < 1.0 / self.max_fps:
+            # Control values still go to the UI, just without a new preview image
+            self.skipped += 1
+            return result
+        self.last_render = now
+
+        frame = result.frame
+        height, width = frame.shape[:2]
+        size = self.fit_size(width, height)
+        if size != (width, height):
+            resized = self.array_pool.acquire((size[1], size[0], 3))
+            cv2.resize(frame, size, dst=resized, interpolation=self.interpolation)
+            result.own(self.array_pool, resized)
+            frame = resized
+        # Copy the pixels into a reused PIL image instead of creating a new one
+        image = self.image_pool.acquire(size)
+        image.frombytes(frame)
+        result.own(self.image_pool, image)
+        result.display_image = image
+        return result
+
+    def update_photo(self, image):
+        """Paste into the existing photo image, only creating a new one when the size changes"""
+        if self.photo is None or self.photo_size != image.size:
+            self.photo = ImageTk.PhotoImage(image)
+            self.photo_size = image.size
+            return True
+        self.photo.paste(image)
+        return False
+
+    def show(self, label, image):
+        """Display an image in a label (called on the Tk thread)"""
+        if self.update_photo(image):
+            label.configure(image=self.photo)
@@ -0,0 +1,279 @@
+import os
+import sys
+import threading
+import time
+import cv2
+import numpy as np
+from buffer_pool import ArrayPool
+
+
+class FrameSource:
+    """Base class for anything that produces BGR frames like cv2.VideoCapture"""
+    # Live sources deliver frames in real time; recorded ones are paced by the reader
+    live = False
+
+    def __init__(self):
+        self.exhausted = False
+
+    def read(self):
+        """Return (ret, frame) in the same way as cv2.VideoCapture.read"""
+        raise NotImplementedError
+
+    def fps(self):
+        """Native frame rate of the source, or 0 if unknown"""
+        return 0
+
+    def capture_time(self):
+        """perf_counter time at which the frame last returned by read() was captured"""
+        return time.perf_counter()
+
+    def recycle(self, frame):
+        """Hand a frame returned by read() back once the caller is done with it"""
+        pass
+
+    def release(self):
+        pass
+
+
+def fourcc_name(code):
+    code = int(code)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\0 ")
+
+
+class CameraSource(FrameSource):
+    """Webcam capture through OpenCV, tuned for the freshest possible frames.
+
+    The pixel format, frame rate and driver buffer size are negotiated when
+    the camera opens; pixel_formats are tried in order until the driver
+    accepts one (MJPG avoids the slow YUYV path on most USB cameras).
+    With grab_thread, a dedicated thread keeps pulling frames off the
+    driver so read() always returns the newest one instead of a frame
+    that sat in the driver queue, and records when each was grabbed.
+    V4L2 is used on Linux; other platforms use OpenCV's default backend.
+    """
+    live = True
+
+    def __init__(self, index=0, width=640, height=480, frame_rate=30, pixel_formats=("MJPG",),
+                 buffer_size=1, grab_thread=True, backend=None):
+        super().__init__()
+        if backend is None:
+            backend = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(index, backend)
+        if not self.cap.isOpened() and backend != cv2.CAP_ANY:
+            # Fall back to whatever backend OpenCV picks by itself
+            self.cap = cv2.VideoCapture(index)
+        self.negotiate(width, height, frame_rate, pixel_formats, buffer_size)
+
+        self.frame = None
+        self.frame_time = None
+        self.read_time = None
+        self.sequence = 0
+        self.read_sequence = 0
+        self.grabbed = 0
+        self.stale = 0
+        self.thread = None
+        # Frames are decoded straight into reused buffers; read() hands ownership to the caller
+        self.pool = ArrayPool()
+        self.frame_shape = None
+        if grab_thread:
+            self.cond = threading.Condition()
+            self.stop_event = threading.Event()
+            self.thread = threading.Thread(target=self.grab_loop, name=f"camera-{index}", daemon=True)
+            self.thread.start()
+
+    def negotiate(self, width, height, frame_rate, pixel_formats, buffer_size):
+        """Ask the driver for a format and record what it actually gave us"""
+        # The pixel format must be set before the size for V4L2 to apply it
+        for name in pixel_formats:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*name))
+            if fourcc_name(self.cap.get(cv2.CAP_PROP_FOURCC)) == name:
+                break
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if frame_rate:
+            self.cap.set(cv2.CAP_PROP_FPS, frame_rate)
+        if buffer_size:
+            # Not every backend supports this; the grab thread covers the rest
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+        self.format = {
+            "backend": self.cap.getBackendName() if self.cap.isOpened() else None,
+            "pixel_format": fourcc_name(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": self.cap.get(cv2.CAP_PROP_FPS),
+            "buffer_size": int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        }
+
+    def grab_loop(self):
+        while not self.stop_event.is_set():
+            if not self.cap.grab():
+                time.sleep(0.005)
+                continue
+            grab_time = time.perf_counter()
+            buffer = self.pool.acquire(self.frame_shape) if self.frame_shape else None
+            ret, frame = self.cap.retrieve(buffer)
+            if not ret:
+                if buffer is not None:
+                    self.pool.release(buffer)
+                continue
+            self.frame_shape = frame.shape
+            stale = None
+            with self.cond:
+                if self.sequence > self.read_sequence:
+                    # The previous frame was never read
+                    self.stale += 1
+                    stale = self.frame
+                self.frame = frame
+                self.frame_time = grab_time
+                self.sequence += 1
+                self.grabbed += 1
+                self.cond.notify_all()
+            if stale is not None:
+                self.pool.release(stale)
+
+    def read(self):
+        if self.thread is None:
+            ret, frame = self.cap.read()
+            self.read_time = time.perf_counter()
+            return ret, frame
+        with self.cond:
+            # Wait for a frame newer than the one returned last time
+            if self.sequence == self.read_sequence:
+                self.cond.wait(1.0)
+            if self.sequence == self.read_sequence:
+                return False, None
+            self.read_sequence = self.sequence
+            self.read_time = self.frame_time
+            return True, self.frame
+
+    def capture_time(self):
+        return self.read_time if self.read_time is not None else time.perf_counter()
+
+    def recycle(self, frame):
+        if self.thread is not None and frame is not None and frame.shape == self.frame_shape:
+            self.pool.release(frame)
+
+    def fps(self):
+        return self.cap.get(cv2.CAP_PROP_FPS) or 30
+
+    def release(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join(1)
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a recorded video file"""
+    def __init__(self, path, loop=False):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video file: {path}")
+        # Frames handed back with recycle() are decoded into again
+        self.pool = ArrayPool()
+        self.frame_shape = None
+
+    def read(self):
+        buffer = self.pool.acquire(self.frame_shape) if self.frame_shape else None
+        ret, frame = self.cap.read(buffer)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(buffer)
+        if not ret:
+            self.exhausted = True
+            if buffer is not None:
+                self.pool.release(buffer)
+            return ret, None
+        self.frame_shape = frame.shape
+        return ret, frame
+
+    def recycle(self, frame):
+        if frame is not None and frame.shape == self.frame_shape:
+            self.pool.release(frame)
+
+    def fps(self):
+        return self.cap.get(cv2.CAP_PROP_FPS) or 30
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Frames loaded from an image sequence, in file name order"""
+    extensions = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, path, frame_rate=30, loop=False):
+        super().__init__()
+        self.files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.lower().endswith(self.extensions))
+        if not self.files:
+            raise IOError(f"No images found in: {path}")
+        self.frame_rate = frame_rate
+        self.loop = loop
+        self.position = 0
+
+    def read(self):
+        if self.position >= len(self.files):
+            if not self.loop:
+                self.exhausted = True
+                return False, None
+            self.position = 0
+        frame = cv2.imread(self.files[self.position])
+        self.position += 1
+        return frame is not None, frame
+
+    def fps(self):
+        return self.frame_rate
+
+
+class SyntheticSource(FrameSource):
+    """Generated frames with a moving blob, for runs without any recorded data"""
+    def __init__(self, width=640, height=480, frame_count=300, frame_rate=30):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.frame_count = frame_count
+        self.frame_rate = frame_rate
+        self.position = 0
+        # Static background gradient, copied for every frame
+        gradient = np.linspace(40, 120, width, dtype=np.uint8)
+        self.background = np.dstack([np.tile(gradient, (height, 1))] * 3)
+        self.pool = ArrayPool()
+
+    def read(self):
+        if self.frame_count and self.position >= self.frame_count:
+            self.exhausted = True
+            return False, None
+        frame = self.pool.acquire(self.background.shape)
+        np.copyto(frame, self.background)
+        angle = self.position * 2 * np.pi / 90
+        center = (int(self.width / 2 + np.cos(angle) * self.width / 4),
+                  int(self.height / 2 + np.sin(angle) * self.height / 4))
+        cv2.circle(frame, center, 40, (90, 140, 200), cv2.FILLED)
+        self.position += 1
+        return True, frame
+
+    def recycle(self, frame):
+        if frame is not None and frame.shape == self.background.shape:
+            self.pool.release(frame)
+
+    def fps(self):
+        return self.frame_rate
+
+
+def open_source(spec, width=640, height=480, loop=False, camera_options=None):
+    """Create a frame source from a camera index, file, directory or 'synthetic'"""
+    camera_options = camera_options or {}
+    if spec is None:
+        return CameraSource(0, width, height, **camera_options)
+    spec = str(spec)
+    if spec.isdigit():
+        return CameraSource(int(spec), width, height, **camera_options)
+    if spec == "synthetic":
+        return SyntheticSource(width, height)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop)
@@ -0,0 +1,66 @@
+class HandGestureState:
+    """Debouncing state for one hand"""
+    def __init__(self):
+        self.active = None
+        self.candidate = None
+        self.count = 0
+        self.last_fired = {}
+
+
+class GestureStateMachine:
+    """Turns noisy per-frame gesture detections into one event per held gesture.
+
+    A gesture becomes active after confirm_frames consecutive detections and
+    fires once, on entry. Leaving it takes release_frames consecutive frames of
+    something else (hysteresis), and the same gesture on the same hand cannot
+    fire again within cooldown seconds.
+    """
+    def __init__(self, confirm_frames=3, release_frames=3, cooldown=1.0):
+        self.confirm_frames = confirm_frames
+        self.release_frames = release_frames
+        self.cooldown = cooldown
+        self.hands = {}
+
+    def update(self, gestures, now, handedness=("Left", "Right")):
+        """Feed one frame of raw detections; return {hand: gesture} for gestures firing now"""
+        fired = {}
+        for hand in handedness:
+            state = self.hands.setdefault(hand, HandGestureState())
+            # A missing hand counts as "no gesture"
+            observed = gestures.get(hand)
+
+            if observed == state.candidate:
+                state.count += 1
+            else:
+                state.candidate = observed
+                state.count = 1
+
+            if state.candidate == state.active:
+                continue
+            needed = self.confirm_frames if state.active is None else max(self.confirm_frames, self.release_frames)
+            if state.candidate is None:
+                needed = self.release_frames
+            if state.count < needed:
+                continue
+
+            state.active = state.candidate
+            if state.active is None:
+                continue
+            last = state.last_fired.get(state.active)
+            if last is None or now - last >= self.cooldown:
+                state.last_fired[state.active] = now
+                fired[hand] = state.active
+        return fired
+
+    def active(self, hand):
+        """Currently held gesture for a hand, or None"""
+        state = self.hands.get(hand)
+        return state.active if state else None
+
+    def pending(self, hand):
+        """True while a gesture is seen on a hand but not yet confirmed"""
+        state = self.hands.get(hand)
+        return state is not None and state.candidate is not None and state.candidate != state.active
+
+    def reset(self):
+        self.hands = {}
@@ -0,0 +1,531 @@
+import threading
+import time
+from collections import deque
+import cv2
+import numpy as np
+import mediapipe as mp
+from actuators import create_actuator_service
+from buffer_pool import ArrayPool
+from pipeline import LatestFrameQueue, release_result
+from gesture_state import GestureStateMachine
+from hand_features import GESTURES, HandFeatures, INDEX_TIP, THUMB_TIP, landmarks_to_array
+from landmark_filters import create_landmark_filter
+from landmark_publisher import LandmarkPublisher
+from landmark_recording import LandmarkRecorder
+from motion_gate import MotionGate
+from pointer_control import create_pointer_controller
+from lite_tracking import LiteHandTracker
+
+
+class FrameResult:
+    """Everything the UI needs to show for one processed frame"""
+    def __init__(self, frame, capture_time):
+        self.frame = frame
+        self.capture_time = capture_time
+        self.processed_time = None
+        # Stage timestamps for telemetry (perf_counter seconds)
+        self.inference_start = None
+        self.inference_end = None
+        self.display_image = None
+        self.annotated = True
+        self.brightness_value = 0
+        self.volume_value = 0
+        self.brightness_frozen = False
+        self.volume_frozen = False
+        self.left_hand_detected = False
+        self.right_hand_detected = False
+        self.events = []
+        self.landmarks = {}
+        self.gestures = {}
+        # Pooled buffers this result owns, as (pool, buffer) pairs
+        self.buffers = []
+
+    def own(self, pool, buffer):
+        """Take ownership of a pooled buffer until release()"""
+        self.buffers.append((pool, buffer))
+
+    def release(self):
+        """Return the pooled buffers to their pools; the result's images must not be used afterwards"""
+        for pool, buffer in self.buffers:
+            pool.release(buffer)
+        self.buffers.clear()
+
+
+class HandControlCore:
+    """Hand tracking, gesture logic and brightness/volume control without any UI"""
+    def __init__(self, apply_controls=True, lite_tracking=False, landmark_filter="one_euro",
+                 predict_latency=False, hand_tracking=True, actuators=None, hand_controls=None,
+                 drawing=True, actuator_backends=None, record_landmarks=None, motion_gate=None,
+                 inference="hands", tasks_options=None, publish=None, pointer=None):
+        # Without apply_controls the values are computed but never sent to hardware.
+        # An existing ActuatorService can be shared between several cores;
+        # otherwise actuator_backends picks the brightness/volume backends by name.
+        self.apply_controls = apply_controls
+        self.actuators = None
+        self.owns_actuators = False
+        if apply_controls:
+            if actuators is not None:
+                self.actuators = actuators
+            else:
+                self.setup_actuators(actuator_backends)
+
+        # A hand mapped to "pointer" in hand_controls moves the pointer on its own
+        # output thread (pointer holds create_pointer_controller options)
+        self.pointer = None
+        if apply_controls and pointer is not None:
+            self.pointer = create_pointer_controller(**pointer)
+        self.pointer_pressed = False
+        # Fingertip area mapped onto the whole screen, and pinch ratios that press and release the button
+        self.pointer_region = (0.15, 0.85)
+        self.click_pinch = (0.35, 0.5)
+
+        # Without hand_tracking, landmarks come from elsewhere through update_controls()
+        self.hands = None
+        self.detector = None
+        self.lite_tracker = None
+        self.tasks_tracker = None
+        self.completed = None
+        # Without drawing, the landmark drawing utilities are never touched
+        self.drawing = drawing
+        if hand_tracking:
+            self.setup_hand_tracking(lite_tracking, inference, tasks_options)
+
+        # Control variables
+        self.brightness_value = 0
+        self.volume_value = 0
+        self.left_hand_detected = False
+        self.right_hand_detected = False
+
+        # Smoothing variables
+        self.brightness_smooth = 0
+        self.volume_smooth = 0
+        self.smoothing_factor = 0.3
+
+        # Landmark filtering replaces the value smoothing above when enabled
+        self.landmark_filter = create_landmark_filter(landmark_filter)
+        if self.landmark_filter is not None:
+            self.smoothing_factor = 1.0
+
+        # Optionally extrapolate landmarks by the measured capture-to-control latency
+        self.predict_latency = predict_latency
+        self.latency = 0.0
+
+        # Thumb-index distance divided by palm size, mapped onto 0-100%
+        self.pinch_range = [0.3, 1.5]
+        # By default the left hand drives brightness and the right hand volume
+        self.hand_controls = hand_controls or {"Left": "brightness", "Right": "volume"}
+
+        # Freeze control variables
+        self.brightness_frozen = False
+        self.volume_frozen = False
+        self.frozen_brightness = 0
+        self.frozen_volume = 0
+
+        # Control state is shared between the inference worker and the UI thread
+        self.lock = threading.RLock()
+
+        # Gestures must be held for a few frames and fire once per hold
+        self.gesture_state = GestureStateMachine(confirm_frames=3, release_frames=3, cooldown=1.0)
+
+        # Gesture feedback waiting for the UI, kept even if frames are dropped
+        self.pending_events = deque(maxlen=32)
+
+        # Optionally skip inference on static scenes (motion_gate holds MotionGate options)
+        self.motion_gate = MotionGate(**motion_gate) if motion_gate is not None else None
+
+        # RGB frames are written into reused buffers that travel with the results;
+        # the flipped BGR frame never leaves process_frame, so one buffer does
+        self.frame_pool = ArrayPool()
+        self.flip_buffer = None
+
+        # Optionally store the raw landmarks of every frame for later replay
+        self.recorder = LandmarkRecorder(record_landmarks) if record_landmarks else None
+
+        # Optionally share landmarks and gesture events with other local processes
+        # (publish holds LandmarkPublisher options)
+        self.publisher = LandmarkPublisher(**publish) if publish is not None else None
+
+    def setup_hand_tracking(self, lite_tracking, inference="hands", tasks_options=None):
+        """Build the MediaPipe hand tracking graph and drawing styles"""
+        self.mpHands = mp.solutions.hands
+        if inference == "tasks":
+            self.setup_tasks_tracking(tasks_options or {})
+
+        # The legacy Hands solution is also the fallback when the Tasks landmarker is unavailable
+        if self.tasks_tracker is None:
+            # Hand tracking setup with improved parameters
+            self.hands = self.mpHands.Hands(
+                static_image_mode=False,
+                model_complexity=1,
+                min_detection_confidence=0.8,
+                min_tracking_confidence=0.8,
+                max_num_hands=2)
+
+            # Optionally follow found hands with the cheaper lite landmark model
+            self.detector = self.hands
+            if lite_tracking:
+                lite = self.mpHands.Hands(
+                    static_image_mode=False,
+                    model_complexity=0,
+                    min_detection_confidence=0.8,
+                    min_tracking_confidence=0.8,
+                    max_num_hands=2)
+                self.lite_tracker = LiteHandTracker(self.hands, lite)
+                self.detector = self.lite_tracker
+
+        if self.drawing:
+            self.draw = mp.solutions.drawing_utils
+            self.draw_styles = mp.solutions.drawing_styles
+
+            # Drawing styles are built once; colors are swapped because we draw on the RGB frame
+            self.landmark_style = self.rgb_styles(self.draw_styles.get_default_hand_landmarks_style())
+            self.connection_style = self.rgb_styles(self.draw_styles.get_default_hand_connections_style())
+
+    def warm_up(self, width=640, height=480):
+        """Run the model once on a blank frame so the first camera frame is not slow"""
+        if self.lite_tracker is not None:
+            self.lite_tracker.warm_up(np.zeros((height, width, 3), dtype=np.uint8))
+        elif self.hands is not None:
+            self.hands.process(np.zeros((height, width, 3), dtype=np.uint8))
+
+    def setup_tasks_tracking(self, options):
+        """Start the asynchronous Tasks HandLandmarker (model path, delegate, ...)"""
+        try:
+            from tasks_inference import TasksHandTracker
+            self.tasks_tracker = TasksHandTracker(self.on_tasks_result, release_result, **options)
+        except Exception as e:
+            print(f"Could not start the Tasks hand landmarker ({e}), using the Hands solution instead")
+            return
+        # Finished frames wait here until the next process_frame call picks them up
+        self.completed = LatestFrameQueue(on_drop=release_result)
+
+    def setup_actuators(self, backends=None):
+        """Start the background writer for screen brightness and system volume"""
+        self.actuators = create_actuator_service(**(backends or {}))
+        self.owns_actuators = True
+
+    def set_brightness(self, level):
+        """Queue a brightness change in percent; never blocks on the display driver"""
+        if self.actuators is not None:
+            self.actuators.set_target("brightness", level)
+
+    def set_volume(self, percent):
+        """Queue a volume change in percent; never blocks on the audio device"""
+        if self.actuators is not None:
+            self.actuators.set_target("volume", percent)
+
+    def set_control(self, control, level):
+        getattr(self, f"set_{control}")(level)
+
+    def rgb_styles(self, styles):
+        """Copy a drawing style mapping with BGR colors converted to RGB"""
+        converted = {}
+        specs = {}
+        for key, spec in styles.items():
+            if id(spec) not in specs:
+                specs[id(spec)] = self.draw.DrawingSpec(color=tuple(reversed(spec.color)),
+                                                        thickness=spec.thickness,
+                                                        circle_radius=spec.circle_radius)
+            converted[key] = specs[id(spec)]
+        return converted
+
+    def process_frame(self, frame, capture_time=None, annotate=True):
+        """Run inference, gestures and controls on one BGR frame.
+
+        The returned result holds the annotated frame in RGB order, the same
+        buffer that was fed to the hand model, so display needs no second
+        color conversion. With annotate=False the landmark and pinch drawing
+        is skipped.
+        """
+        inference_start = time.perf_counter()
+        if capture_time is None:
+            capture_time = inference_start
+        if self.motion_gate is not None and not self.motion_gate.should_process(frame, capture_time):
+            return self.skip_inference(frame, capture_time, annotate and self.drawing)
+        if self.tasks_tracker is not None:
+            return self.submit_async(frame, capture_time, annotate and self.drawing, inference_start)
+        result = FrameResult(None, capture_time)
+        frame = self.to_rgb(frame, result)
+        processed = self.detector.process(frame)
+
+        annotate = annotate and self.drawing
+        result.annotated = annotate
+        result.inference_start = inference_start
+        hands = self.get_left_right_landmarks(frame, processed, annotate)
+        result.inference_end = time.perf_counter()
+        if hands and self.motion_gate is not None:
+            self.motion_gate.hands_seen(capture_time)
+        height, width, _ = frame.shape
+        self.update_controls(result, hands, (width, height))
+        return result
+
+    def submit_async(self, frame, capture_time, annotate, inference_start):
+        """Queue a frame on the Tasks landmarker and return the newest finished result, if any.
+
+        Results come back in frame order with their own capture timestamps,
+        typically one or two frames behind the frame just submitted.
+        """
+        result = FrameResult(None, capture_time)
+        self.to_rgb(frame, result)
+        result.annotated = annotate
+        result.inference_start = inference_start
+        if not self.tasks_tracker.submit(result.frame, capture_time, result):
+            result.release()
+        return self.completed.get_nowait()
+
+    def on_tasks_result(self, processed, result):
+        """Gesture and control stage for a frame finished by the Tasks landmarker (MediaPipe thread)"""
+        try:
+            hands = self.get_left_right_landmarks(result.frame, processed, result.annotated)
+            result.inference_end = time.perf_counter()
+            if hands and self.motion_gate is not None:
+                self.motion_gate.hands_seen(result.capture_time)
+            height, width, _ = result.frame.shape
+            self.update_controls(result, hands, (width, height))
+        except Exception as e:
+            print(f"Error handling hand landmarker result: {e}")
+            result.release()
+            return
+        self.completed.put(result)
+
+    def to_rgb(self, frame, result):
+        """Mirror a BGR frame into a pooled RGB buffer owned by result"""
+        if self.flip_buffer is None or self.flip_buffer.shape != frame.shape:
+            self.flip_buffer = np.empty_like(frame)
+        cv2.flip(frame, 1, dst=self.flip_buffer)
+        rgb = self.frame_pool.acquire(frame.shape)
+        cv2.cvtColor(self.flip_buffer, cv2.COLOR_BGR2RGB, dst=rgb)
+        result.own(self.frame_pool, rgb)
+        result.frame = rgb
+        return rgb
+
+    def skip_inference(self, frame, capture_time, annotate):
+        """Result for a frame the motion gate kept away from the hand model"""
+        result = FrameResult(None, capture_time)
+        if annotate:
+            # The preview keeps updating while inference is skipped
+            self.to_rgb(frame, result)
+        result.annotated = annotate
+        with self.lock:
+            # The gate only skips once no hands have been seen for a while
+            self.left_hand_detected = False
+            self.right_hand_detected = False
+            self.fill_state(result)
+        result.processed_time = time.perf_counter()
+        return result
+
+    def update_controls(self, result, hands, image_size):
+        """Evaluate gestures and brightness/volume for the hands found in one frame"""
+        if self.recorder is not None:
+            self.recorder.record(result.capture_time, hands, image_size)
+        if self.landmark_filter is not None:
+            horizon = self.latency if self.predict_latency else 0.0
+            hands = self.landmark_filter.filter(hands, result.capture_time, horizon)
+        handedness = list(hands)
+        features = HandFeatures.from_hands([hands[name] for name in handedness], image_size)
+        gestures = dict(zip(handedness, GESTURES.evaluate(features)))
+        result.landmarks = hands
+        result.gestures = gestures
+        if self.pointer is not None:
+            self.update_pointer(result, hands, handedness, features)
+
+        with self.lock:
+            # Check for gesture-based controls
+            fired = self.gesture_state.update(gestures, result.capture_time)
+            result.events = self.check_gesture_controls(fired)
+            self.pending_events.extend(result.events)
+
+            self.left_hand_detected = "Left" in hands
+            self.right_hand_detected = "Right" in hands
+
+            for hand, control in self.hand_controls.items():
+                if control in (None, "pointer") or hand not in hands or getattr(self, f"{control}_frozen"):
+                    continue
+                if self.gesture_state.pending(hand) or self.gesture_state.active(hand) is not None:
+                    # Hold the value while a gesture is being confirmed or held, so the
+                    # gesture's own pinch distance is not what a freeze locks in
+                    # and does not undo a reset
+                    continue
+                index = handedness.index(hand)
+                if result.annotated:
+                    self.draw_pinch(result.frame, features.points[index])
+                level = np.interp(features.pinch[index], self.pinch_range, [0, 100])
+                level = np.clip(level, 0, 100)
+
+                # Apply smoothing
+                smooth = getattr(self, f"{control}_smooth") * (1 - self.smoothing_factor) + level * self.smoothing_factor
+                setattr(self, f"{control}_smooth", smooth)
+
+                self.set_control(control, int(smooth))
+                setattr(self, f"{control}_value", int(smooth))
+
+            # Frozen controls keep their frozen value
+            if self.brightness_frozen:
+                self.brightness_value = self.frozen_brightness
+            if self.volume_frozen:
+                self.volume_value = self.frozen_volume
+
+            self.fill_state(result)
+
+        if self.publisher is not None:
+            self.publisher.publish(result.capture_time, hands, image_size, result)
+        result.processed_time = time.perf_counter()
+        # Running average of how long a frame takes from capture to control output
+        self.latency += 0.1 * (result.processed_time - result.capture_time - self.latency)
+
+    def update_pointer(self, result, hands, handedness, features):
+        """Hand the pointer hand's index fingertip and pinch state to the pointer thread"""
+        hand = next((hand for hand, control in self.hand_controls.items() if control == "pointer"), None)
+        if hand not in hands:
+            self.pointer_pressed = False
+            self.pointer.update(None, False, result.capture_time)
+            return
+        index = handedness.index(hand)
+        low, high = self.pointer_region
+        position = np.clip((hands[hand][INDEX_TIP, :2] - low) / (high - low), 0.0, 1.0)
+        # Separate press and release thresholds keep the button from chattering
+        press, release = self.click_pinch
+        self.pointer_pressed = features.pinch[index] < (release if self.pointer_pressed else press)
+        self.pointer.update(position, self.pointer_pressed, result.capture_time)
+        if result.annotated and result.frame is not None:
+            x, y = int(features.points[index][INDEX_TIP][0]), int(features.points[index][INDEX_TIP][1])
+            color = (255, 0, 0) if self.pointer_pressed else (0, 255, 255)
+            cv2.circle(result.frame, (x, y), 12, color, 2)
+
+    def fill_state(self, result):
+        """Copy the current control state into a frame result"""
+        result.brightness_value = self.brightness_value
+        result.volume_value = self.volume_value
+        result.brightness_frozen = self.brightness_frozen
+        result.volume_frozen = self.volume_frozen
+        result.left_hand_detected = self.left_hand_detected
+        result.right_hand_detected = self.right_hand_detected
+
+    def pop_events(self):
+        """Return and clear gesture feedback events not yet shown"""
+        events = []
+        while self.pending_events:
+            events.append(self.pending_events.popleft())
+        return events
+
+    def check_gesture_controls(self, gestures):
+        """Apply newly confirmed gestures to the freeze controls and return feedback events"""
+        events = []
+        for handedness in ("Left", "Right"):
+            gesture = gestures.get(handedness)
+            control = self.hand_controls.get(handedness)
+            if gesture is None or control is None:
+                continue
+            if control == "pointer" and gesture != "reset":
+                # A fist or open hand is an ordinary pose while pointing
+                continue
+            frozen = getattr(self, f"{control}_frozen", False)
+            if gesture == "freeze":
+                if not frozen:
+                    getattr(self, f"freeze_{control}")()
+                    events.append((f"{handedness} hand: FREEZE {control.upper()}", "green"))
+                    self.publish_event(handedness, gesture, control)
+            elif gesture == "release":
+                if frozen:
+                    getattr(self, f"unfreeze_{control}")()
+                    events.append((f"{handedness} hand: RELEASE {control.upper()}", "blue"))
+                    self.publish_event(handedness, gesture, control)
+            elif gesture == "reset":
+                self.reset_controls()
+                events.append((f"{handedness} hand: RESET ALL", "red"))
+                self.publish_event(handedness, gesture)
+        return events
+
+    def publish_event(self, handedness, gesture, control=None):
+        """Forward a gesture that changed the controls to local subscribers"""
+        if self.publisher is not None:
+            self.publisher.publish_event(handedness, gesture, control, brightness=self.brightness_value,
+                                         volume=self.volume_value)
+
+    def get_left_right_landmarks(self, frame, processed, draw=True):
+        """Return a (21, 3) landmark array per detected hand, keyed by handedness"""
+        hands = {}
+
+        if processed.multi_hand_landmarks:
+            if processed.multi_handedness:
+                for i, hand_handedness in enumerate(processed.multi_handedness):
+                    handedness = hand_handedness.classification[0].label
+                    landmarks = processed.multi_hand_landmarks[i]
+
+                    if handedness in ("Left", "Right"):
+                        hands[handedness] = landmarks_to_array(landmarks)
+
+                    # Draw hand landmarks with enhanced styling
+                    if draw:
+                        self.draw.draw_landmarks(
+                            frame,
+                            landmarks,
+                            self.mpHands.HAND_CONNECTIONS,
+                            self.landmark_style,
+                            self.connection_style
+                        )
+
+        return hands
+
+    def draw_pinch(self, frame, points):
+        """Draw the thumb and index finger tips and the line between them"""
+        if frame is None:
+            return
+        x1, y1 = int(points[THUMB_TIP][0]), int(points[THUMB_TIP][1])
+        x2, y2 = int(points[INDEX_TIP][0]), int(points[INDEX_TIP][1])
+
+        # Draw enhanced circles and line
+        cv2.circle(frame, (x1, y1), 10, (0, 255, 0), cv2.FILLED)
+        cv2.circle(frame, (x1, y1), 15, (0, 255, 0), 2)
+        cv2.circle(frame, (x2, y2), 10, (0, 255, 0), cv2.FILLED)
+        cv2.circle(frame, (x2, y2), 15, (0, 255, 0), 2)
+        cv2.line(frame, (x1, y1), (x2, y2), (0, 255, 0), 3)
+
+    def freeze_brightness(self):
+        """Freeze brightness control"""
+        with self.lock:
+            self.brightness_frozen = True
+            self.frozen_brightness = self.brightness_value
+
+    def unfreeze_brightness(self):
+        """Unfreeze brightness control"""
+        with self.lock:
+            self.brightness_frozen = False
+
+    def freeze_volume(self):
+        """Freeze volume control"""
+        with self.lock:
+            self.volume_frozen = True
+            self.frozen_volume = self.volume_value
+
+    def unfreeze_volume(self):
+        """Unfreeze volume control"""
+        with self.lock:
+            self.volume_frozen = False
+
+    def reset_controls(self):
+        """Reset both controls to 0"""
+        with self.lock:
+            self.brightness_value = 0
+            self.volume_value = 0
+            self.brightness_smooth = 0
+            self.volume_smooth = 0
+            self.set_brightness(0)
+            self.set_volume(0)
+
+    def close(self):
+        """Release the hand tracking graph and finish any pending control writes"""
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.publisher is not None:
+            self.publisher.close()
+        if self.lite_tracker is not None:
+            self.lite_tracker.close()
+        elif self.hands is not None:
+            self.hands.close()
+        if self.tasks_tracker is not None:
+            self.tasks_tracker.close()
+        if self.pointer is not None:
+            self.pointer.stop()
+        if self.owns_actuators:
+            self.actuators.stop()
@@ -0,0 +1,184 @@
+"""Always-on gesture control without any user interface.
+
+Usage:
+    python hand_daemon.py [--source 0] [--status-interval 60]
+
+Only capture, hand tracking, gesture logic and the actuators run: there is
+no Tk window, no preview image and no landmark drawing, so Tk and the
+display module are never imported. (PIL still gets loaded: importing
+mediapipe pulls in its drawing utilities, which import matplotlib.)
+"""
+import argparse
+import signal
+import sys
+import threading
+import time
+from frame_sources import open_source
+from hand_control import HandControlCore
+from pipeline import CaptureThread, LatestFrameQueue
+from pointer_control import pointer_hand_controls
+
+# Modules a daemon run should never load; PIL is not listed because
+# `import mediapipe` always loads it through matplotlib
+UI_MODULES = ("tkinter", "display")
+
+
+class HandDaemon:
+    """Capture thread feeding a single processing loop on the calling thread"""
+    def __init__(self, source, status_interval=0, core_options=None, telemetry=None):
+        self.source = source
+        self.status_interval = status_interval
+        core_options = dict(core_options or {})
+        core_options["drawing"] = False
+        self.core = HandControlCore(**core_options)
+        # Frames replaced before they were processed go back to the source's pool
+        self.frames = LatestFrameQueue(on_drop=lambda item: source.recycle(item[0]))
+        self.capture_thread = CaptureThread(source, self.frames)
+        self.stop_event = threading.Event()
+        self.telemetry = telemetry
+        if telemetry is not None:
+            telemetry.actuators = self.core.actuators
+        self.processed = 0
+        self.events = 0
+
+    def run(self):
+        """Process frames until stopped or the source runs out"""
+        self.capture_thread.start()
+        last_status = time.perf_counter()
+        last_processed = 0
+        while not self.stop_event.is_set():
+            item = self.frames.get(timeout=0.5)
+            if item is None:
+                if not self.capture_thread.is_alive():
+                    break
+                continue
+            frame, capture_time = item
+            result = self.core.process_frame(frame, capture_time, annotate=False)
+            # Nothing keeps the frames, so their buffers go straight back for reuse
+            self.source.recycle(frame)
+            if result is None:
+                # Asynchronous inference: no frame has finished yet
+                continue
+            result.release()
+            self.processed += 1
+            if self.telemetry is not None:
+                self.telemetry.record(result, dropped=self.frames.dropped)
+            for message, _ in result.events:
+                self.events += 1
+                print(message, flush=True)
+
+            if self.status_interval:
+                now = time.perf_counter()
+                if now - last_status >= self.status_interval:
+                    self.log_status((self.processed - last_processed) / (now - last_status))
+                    last_status = now
+                    last_processed = self.processed
+
+    def log_status(self, fps):
+        core = self.core
+        hands = [name for name, seen in (("left", core.left_hand_detected), ("right", core.right_hand_detected))
+                 if seen]
+        print(f"{fps:.1f} fps, {self.frames.dropped} dropped, latency {core.latency * 1000:.0f} ms, "
+              f"hands: {', '.join(hands) or 'none'}, brightness {core.brightness_value}%, "
+              f"volume {core.volume_value}%{', idle' if core.motion_gate and core.motion_gate.idle else ''}",
+              flush=True)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def close(self):
+        self.capture_thread.stop()
+        self.frames.close()
+        self.capture_thread.join(1)
+        self.source.release()
+        self.core.close()
+
+
+def check_no_ui_modules():
+    """Warn if anything pulled a UI module into this process"""
+    loaded = [name for name in UI_MODULES if name in sys.modules]
+    if loaded:
+        print(f"Warning: UI modules loaded in daemon mode: {', '.join(loaded)}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless hand gesture control daemon")
+    parser.add_argument("--source", help="camera index, video file, image directory or 'synthetic'")
+    parser.add_argument("--loop", action="store_true", help="loop video files and image directories")
+    parser.add_argument("--camera-fps", type=float, default=30)
+    parser.add_argument("--pixel-format", choices=["MJPG", "YUYV", "auto"], default="MJPG")
+    parser.add_argument("--status-interval", type=float, default=0,
+                        help="print a status line every this many seconds (0 = never)")
+    parser.add_argument("--dry-run", action="store_true", help="compute controls without changing them")
+    parser.add_argument("--lite-tracking", action="store_true",
+                        help="track found hands with the cheaper lite model")
+    parser.add_argument("--landmark-filter", choices=["one_euro", "kalman", "none"], default="one_euro")
+    parser.add_argument("--inference", choices=["hands", "tasks"], default="hands",
+                        help="legacy Hands solution or the asynchronous Tasks HandLandmarker")
+    parser.add_argument("--model", default="hand_landmarker.task", help="HandLandmarker model for --inference tasks")
+    parser.add_argument("--delegate", choices=["cpu", "gpu"], default="cpu")
+    parser.add_argument("--brightness-backend", choices=["auto", "sbc", "sysfs", "mock"], default="auto")
+    parser.add_argument("--volume-backend", choices=["auto", "pycaw", "pulse", "alsa", "mock"], default="auto")
+    parser.add_argument("--pointer", choices=["left", "right"], help="drive the pointer with this hand")
+    parser.add_argument("--pointer-sink", choices=["auto", "uinput", "mock"], default="auto")
+    parser.add_argument("--pointer-rate", type=float, default=240)
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="skip hand tracking while the scene is static and no hands were seen recently")
+    parser.add_argument("--idle-after", type=float, default=30)
+    parser.add_argument("--idle-fps", type=float, default=2)
+    parser.add_argument("--record-landmarks", metavar="PATH", help="save every frame's hand landmarks for replay")
+    parser.add_argument("--publish", metavar="NAME", help="share landmarks and gesture events with local processes")
+    parser.add_argument("--event-socket", metavar="PATH")
+    parser.add_argument("--telemetry-dump", metavar="PATH",
+                        help="periodically append frame timings to a .csv file or write a .json summary")
+    parser.add_argument("--telemetry-interval", type=float, default=60)
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of the last frames on exit")
+    args = parser.parse_args(argv)
+
+    telemetry = None
+    if args.telemetry_dump or args.trace:
+        from telemetry import Telemetry
+        telemetry = Telemetry()
+        if args.telemetry_dump:
+            telemetry.start_dumps(args.telemetry_dump, args.telemetry_interval)
+
+    source = open_source(args.source, loop=args.loop, camera_options={
+        "frame_rate": args.camera_fps,
+        "pixel_formats": () if args.pixel_format == "auto" else (args.pixel_format,),
+    })
+    if getattr(source, "format", None):
+        print("Camera: " + ", ".join(f"{key} {value}" for key, value in source.format.items()), flush=True)
+    daemon = HandDaemon(source, args.status_interval, {
+        "apply_controls": not args.dry_run,
+        "lite_tracking": args.lite_tracking,
+        "landmark_filter": args.landmark_filter,
+        "actuator_backends": {"brightness": args.brightness_backend, "volume": args.volume_backend},
+        "record_landmarks": args.record_landmarks,
+        "motion_gate": {"idle_after": args.idle_after, "idle_fps": args.idle_fps} if args.motion_gate else None,
+        "inference": args.inference,
+        "tasks_options": {"model_path": args.model, "delegate": args.delegate},
+        "publish": {"name": args.publish, "socket_path": args.event_socket} if args.publish else None,
+        "hand_controls": pointer_hand_controls(args.pointer),
+        "pointer": {"sink": args.pointer_sink, "rate": args.pointer_rate} if args.pointer else None,
+    }, telemetry)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    check_no_ui_modules()
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        if telemetry is not None:
+            telemetry.stop_dumps()
+            if args.telemetry_dump:
+                telemetry.dump(args.telemetry_dump)
+            if args.trace:
+                telemetry.export_chrome_trace(args.trace)
+    print(f"Processed {daemon.processed} frames, {daemon.events} gesture events", flush=True)
+    if daemon.core.pointer is not None:
+        print(daemon.core.pointer.report(), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import numpy as np
+
+# Landmark indices (see the MediaPipe hand landmark model)
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])  # Thumb, index, middle, ring, pinky tips
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])  # Thumb IP joint, then the other fingers' pips
+
+# Each finger as a chain from the wrist to its tip, used for joint angles
+FINGER_CHAINS = np.array([
+    [0, 1, 2, 3, 4],
+    [0, 5, 6, 7, 8],
+    [0, 9, 10, 11, 12],
+    [0, 13, 14, 15, 16],
+    [0, 17, 18, 19, 20],
+])
+
+
+def landmarks_to_array(landmarks):
+    """Convert a MediaPipe landmark list to a (21, 3) float32 array of normalized x, y, z"""
+    return np.array([(point.x, point.y, point.z) for point in landmarks.landmark], dtype=np.float32)
+
+
+class HandFeatures:
+    """Per-hand features computed in one vectorized pass over an (N, 21, 3) landmark array"""
+    def __init__(self, landmarks, image_size):
+        width, height = image_size
+        self.landmarks = landmarks
+        self.count = len(landmarks)
+
+        # Pixel coordinates so distances are not skewed by the frame's aspect ratio
+        # (MediaPipe scales z roughly like x)
+        self.points = landmarks * np.array([width, height, width], dtype=np.float32)
+
+        # Finger extended when its tip is above its pip joint (image y grows downwards)
+        self.extended = landmarks[:, FINGER_TIPS, 1] < landmarks[:, FINGER_PIPS, 1]
+
+        # Palm size (wrist to middle finger base) makes the pinch independent of hand distance
+        palm = np.linalg.norm(self.points[:, MIDDLE_MCP, :2] - self.points[:, WRIST, :2], axis=1)
+        self.palm_size = np.maximum(palm, 1e-6)
+        self.pinch_distance = np.linalg.norm(self.points[:, THUMB_TIP, :2] - self.points[:, INDEX_TIP, :2], axis=1)
+        self.pinch = self.pinch_distance / self.palm_size
+
+        # Angle in degrees at the three inner joints of every finger (180 = straight)
+        before = self.points[:, FINGER_CHAINS[:, :-2]] - self.points[:, FINGER_CHAINS[:, 1:-1]]
+        after = self.points[:, FINGER_CHAINS[:, 2:]] - self.points[:, FINGER_CHAINS[:, 1:-1]]
+        norms = np.linalg.norm(before, axis=-1) * np.linalg.norm(after, axis=-1)
+        cosine = np.sum(before * after, axis=-1) / np.maximum(norms, 1e-6)
+        self.joint_angles = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+    @classmethod
+    def from_hands(cls, hands, image_size):
+        """Build features for a list of (21, 3) landmark arrays"""
+        if hands:
+            landmarks = np.stack(hands)
+        else:
+            landmarks = np.zeros((0, 21, 3), dtype=np.float32)
+        return cls(landmarks, image_size)
+
+
+class GestureRegistry:
+    """Named gestures, each a vectorized predicate over HandFeatures.
+
+    Gestures are checked in registration order and the first match wins, so
+    more important gestures should be registered first.
+    """
+    def __init__(self):
+        self.names = []
+        self.predicates = []
+
+    def register(self, name, predicate=None):
+        """Register a predicate returning one bool per hand; usable as a decorator"""
+        if predicate is None:
+            def decorator(fn):
+                self.register(name, fn)
+                return fn
+            return decorator
+        if name in self.names:
+            index = self.names.index(name)
+            self.predicates[index] = predicate
+        else:
+            self.names.append(name)
+            self.predicates.append(predicate)
+        return predicate
+
+    def evaluate(self, features):
+        """Return the first matching gesture name (or None) for every hand"""
+        if features.count == 0 or not self.predicates:
+            return [None] * features.count
+        matches = np.stack([np.asarray(predicate(features), dtype=bool) for predicate in self.predicates])
+        first = matches.argmax(axis=0)
+        found = matches.any(axis=0)
+        return [self.names[index] if hit else None for index, hit in zip(first, found)]
+
+
+GESTURES = GestureRegistry()
+
+
+@GESTURES.register("freeze")
+def closed_fist(features):
+    """Closed fist: all fingers closed, including the thumb (a raised thumb is "reset")"""
+    return ~features.extended.any(axis=1)
+
+
+@GESTURES.register("release")
+def four_fingers(features):
+    """Four fingers extended with the thumb closed"""
+    return features.extended[:, 1:].all(axis=1) & ~features.extended[:, 0]
+
+
+@GESTURES.register("reset")
+def thumbs_up(features):
+    """Thumb extended with the other fingers closed"""
+    return features.extended[:, 0] & ~features.extended[:, 1:].any(axis=1)
@@ -0,0 +1,150 @@
+import numpy as np
+
+# Filter state is kept in one array for both hands so every update is a single vectorized pass
+HAND_SLOTS = {"Left": 0, "Right": 1}
+
+
+class LandmarkFilter:
+    """Base class for filters over the (21, 3) landmark arrays of all hands.
+
+    A hand that disappears has its state dropped, so it restarts cleanly when
+    it comes back. filter() can also extrapolate each landmark along its
+    estimated velocity by `horizon` seconds to hide pipeline latency.
+    """
+    def __init__(self, max_horizon=0.1):
+        self.max_horizon = max_horizon
+        shape = (len(HAND_SLOTS), 21, 3)
+        self.x = np.zeros(shape, dtype=np.float32)
+        self.v = np.zeros(shape, dtype=np.float32)
+        self.t = np.zeros(len(HAND_SLOTS))
+        self.valid = np.zeros(len(HAND_SLOTS), dtype=bool)
+
+    def filter(self, hands, timestamp, horizon=0.0):
+        """Filter {handedness: landmarks} measured at timestamp; returns the same shape"""
+        present = np.zeros(len(HAND_SLOTS), dtype=bool)
+        measured = self.x.copy()
+        for name, landmarks in hands.items():
+            slot = HAND_SLOTS.get(name)
+            if slot is not None:
+                present[slot] = True
+                measured[slot] = landmarks
+
+        # Hands seen last frame are updated, new ones start from the measurement
+        update = present & self.valid
+        start = present & ~self.valid
+        dt = np.maximum(timestamp - self.t, 1e-3)[:, None, None]
+        if update.any():
+            self.step(measured, dt, update[:, None, None])
+        self.x[start] = measured[start]
+        self.v[start] = 0
+        self.t[present] = timestamp
+        self.valid = present
+
+        horizon = min(max(horizon, 0.0), self.max_horizon)
+        output = self.x + self.v * horizon if horizon else self.x
+        filtered = {}
+        for name, landmarks in hands.items():
+            slot = HAND_SLOTS.get(name)
+            filtered[name] = output[slot].copy() if slot is not None else landmarks
+        return filtered
+
+    def step(self, measured, dt, mask):
+        """Update self.x and self.v in place for the slots selected by mask"""
+        raise NotImplementedError
+
+    def reset(self):
+        self.valid[:] = False
+
+
+class OneEuroLandmarkFilter(LandmarkFilter):
+    """One Euro filter: heavy smoothing when still, little lag when moving fast.
+
+    min_cutoff (Hz) sets the smoothing at rest and beta how quickly the cutoff
+    rises with speed (in normalized image units per second).
+    """
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0, max_horizon=0.1):
+        super().__init__(max_horizon)
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+    @staticmethod
+    def alpha(dt, cutoff):
+        tau = 1.0 / (2 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def step(self, measured, dt, mask):
+        velocity = (measured - self.x) / dt
+        a_d = self.alpha(dt, self.d_cutoff)
+        v = a_d * velocity + (1 - a_d) * self.v
+
+        cutoff = self.min_cutoff + self.beta * np.abs(v)
+        a = self.alpha(dt, cutoff)
+        x = a * measured + (1 - a) * self.x
+
+        np.copyto(self.x, x, where=mask)
+        np.copyto(self.v, v, where=mask)
+
+
+class KalmanLandmarkFilter(LandmarkFilter):
+    """Constant-velocity Kalman filter, run independently on every coordinate.
+
+    process_noise is the acceleration variance and measurement_noise the
+    landmark jitter variance, both in normalized image units.
+    """
+    def __init__(self, process_noise=2.0, measurement_noise=2.5e-5, max_horizon=0.1):
+        super().__init__(max_horizon)
+        self.q = process_noise
+        self.r = measurement_noise
+        # 2x2 covariance per coordinate, stored as its three distinct entries
+        self.p00 = np.ones_like(self.x)
+        self.p01 = np.zeros_like(self.x)
+        self.p11 = np.ones_like(self.x)
+
+    def step(self, measured, dt, mask):
+        # Predict
+        x = self.x + self.v * dt
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + self.q * dt ** 4 / 4
+        p01 = self.p01 + dt * self.p11 + self.q * dt ** 3 / 2
+        p11 = self.p11 + self.q * dt ** 2
+
+        # Update with the measured position
+        s = p00 + self.r
+        k0 = p00 / s
+        k1 = p01 / s
+        innovation = measured - x
+        x = x + k0 * innovation
+        v = self.v + k1 * innovation
+        p11 = p11 - k1 * p01
+        p01 = (1 - k0) * p01
+        p00 = (1 - k0) * p00
+
+        for target, value in ((self.x, x), (self.v, v), (self.p00, p00), (self.p01, p01), (self.p11, p11)):
+            np.copyto(target, value, where=mask)
+
+    def filter(self, hands, timestamp, horizon=0.0):
+        # Newly appearing hands start with a fresh covariance
+        start = np.zeros(len(HAND_SLOTS), dtype=bool)
+        for name in hands:
+            slot = HAND_SLOTS.get(name)
+            if slot is not None and not self.valid[slot]:
+                start[slot] = True
+        self.p00[start] = self.r
+        self.p01[start] = 0
+        self.p11[start] = 1.0
+        return super().filter(hands, timestamp, horizon)
+
+
+LANDMARK_FILTERS = {
+    "none": None,
+    "one_euro": OneEuroLandmarkFilter,
+    "kalman": KalmanLandmarkFilter,
+}
+
+
+def create_landmark_filter(name):
+    """Build a landmark filter by name, or None for no filtering"""
+    if name not in LANDMARK_FILTERS:
+        raise ValueError(f"Unknown landmark filter: {name}")
+    filter_class = LANDMARK_FILTERS[name]
+    return filter_class() if filter_class else None
@@ -0,0 +1,209 @@
+"""Share hand landmarks and gesture events with other processes on this machine.
+
+Landmarks go into a ring buffer in multiprocessing shared memory, one
+SLOT_DTYPE row per processed frame. Rows are written with a sequence
+counter (a seqlock): it is odd while a row is being written and
+2 * frame + 2 once frame is complete, so readers never take a lock and
+detect a row that was overwritten under them. Gesture events (freeze,
+release, reset) are sent as JSON lines to every client of a UNIX socket.
+landmark_subscriber.py is the reading side.
+"""
+import json
+import os
+import select
+import socket
+import tempfile
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+import numpy as np
+from landmark_filters import HAND_SLOTS
+
+DEFAULT_NAME = "hand_landmarks"
+MAGIC = b"HANDSHM1"
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("capacity", np.uint32),
+    ("slot_size", np.uint32),
+    # Number of frames published so far; frame n lives in slot n % capacity
+    ("head", np.uint64),
+], align=True)
+HEADER_SIZE = 64
+
+SLOT_DTYPE = np.dtype([
+    ("sequence", np.uint64),
+    ("frame", np.uint64),
+    # time.perf_counter() at capture; CLOCK_MONOTONIC on Linux, so comparable across processes
+    ("timestamp", np.float64),
+    ("width", np.uint16),
+    ("height", np.uint16),
+    ("brightness", np.uint8),
+    ("volume", np.uint8),
+    ("brightness_frozen", np.bool_),
+    ("volume_frozen", np.bool_),
+    ("present", np.bool_, (len(HAND_SLOTS),)),
+    ("landmarks", np.float32, (len(HAND_SLOTS), 21, 3)),
+], align=True)
+
+
+def default_socket_path(name):
+    return os.path.join(tempfile.gettempdir(), f"{name}.sock")
+
+
+class EventServer:
+    """Sends events as JSON lines to every client connected to a UNIX socket.
+
+    A background thread accepts clients and does the sending, so send()
+    only queues the event. A client that cannot take a whole line without
+    blocking is disconnected instead of slowing the publisher down.
+    """
+    def __init__(self, path, backlog=256):
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(path)
+        self.listener.listen(8)
+        self.listener.setblocking(False)
+        self.clients = []
+        self.queue = deque(maxlen=backlog)
+        self.wake_reader, self.wake_writer = socket.socketpair()
+        self.wake_reader.setblocking(False)
+        self.wake_writer.setblocking(False)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="event-server", daemon=True)
+        self.thread.start()
+
+    def send(self, event):
+        self.queue.append((json.dumps(event) + "\n").encode())
+        try:
+            self.wake_writer.send(b"\0")
+        except BlockingIOError:
+            # A wake-up is already pending
+            pass
+
+    def run(self):
+        while not self.stop_event.is_set():
+            readable, _, _ = select.select([self.listener, self.wake_reader], [], [], 0.5)
+            if self.listener in readable:
+                self.accept_clients()
+            if self.wake_reader in readable:
+                try:
+                    while self.wake_reader.recv(4096):
+                        pass
+                except BlockingIOError:
+                    pass
+            while self.queue:
+                self.broadcast(self.queue.popleft())
+        # Events queued while stopping, including the final "closed"
+        while self.queue:
+            self.broadcast(self.queue.popleft())
+
+    def accept_clients(self):
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except BlockingIOError:
+                return
+            client.setblocking(False)
+            self.clients.append(client)
+
+    def broadcast(self, line):
+        for client in list(self.clients):
+            try:
+                if client.send(line) == len(line):
+                    continue
+            except OSError:
+                pass
+            self.clients.remove(client)
+            client.close()
+
+    def close(self):
+        self.stop_event.set()
+        self.send({"event": "closed"})
+        self.thread.join(timeout=1.0)
+        for client in self.clients:
+            client.close()
+        self.listener.close()
+        self.wake_reader.close()
+        self.wake_writer.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class LandmarkPublisher:
+    """Writes per-frame landmarks to the shared ring and forwards gesture events.
+
+    There must be only one publisher per name. With socket_path=None the
+    event socket goes to the temp directory as NAME.sock; socket_path=False
+    disables it.
+    """
+    def __init__(self, name=DEFAULT_NAME, capacity=64, socket_path=None):
+        self.name = name
+        self.capacity = capacity
+        size = HEADER_SIZE + capacity * SLOT_DTYPE.itemsize
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a publisher that did not shut down cleanly
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        self.slots = np.ndarray((capacity,), dtype=SLOT_DTYPE, buffer=self.shm.buf, offset=HEADER_SIZE)
+        self.slots["sequence"] = 0
+        self.header["capacity"] = capacity
+        self.header["slot_size"] = SLOT_DTYPE.itemsize
+        self.header["head"] = 0
+        # Written last: subscribers refuse to attach until the header is complete
+        self.header["magic"] = MAGIC
+        self.frame = 0
+
+        self.events = None
+        if socket_path is not False:
+            if hasattr(socket, "AF_UNIX"):
+                self.events = EventServer(socket_path or default_socket_path(name))
+            else:
+                print("UNIX sockets are not available on this platform, gesture events are not published")
+
+    def publish(self, timestamp, hands, image_size, result=None):
+        """Write {handedness: (21, 3) landmarks} and, from result, the control state of one frame"""
+        frame = self.frame
+        slot = self.slots[frame % self.capacity]
+        slot["sequence"] = 2 * frame + 1
+        slot["frame"] = frame
+        slot["timestamp"] = timestamp
+        slot["width"], slot["height"] = image_size
+        if result is not None:
+            slot["brightness"] = result.brightness_value
+            slot["volume"] = result.volume_value
+            slot["brightness_frozen"] = result.brightness_frozen
+            slot["volume_frozen"] = result.volume_frozen
+        slot["present"] = False
+        for name, landmarks in hands.items():
+            index = HAND_SLOTS.get(name)
+            if index is not None:
+                slot["present"][index] = True
+                slot["landmarks"][index] = landmarks
+        slot["sequence"] = 2 * frame + 2
+        self.header["head"] = frame + 1
+        self.frame = frame + 1
+
+    def publish_event(self, hand, event, control=None, **fields):
+        """Send a discrete gesture event such as freeze, release or reset"""
+        if self.events is None:
+            return
+        message = {"event": event, "hand": hand, "control": control,
+                   "time": time.perf_counter(), "frame": self.frame - 1}
+        message.update(fields)
+        self.events.send(message)
+
+    def close(self):
+        if self.events is not None:
+            self.events.close()
+        del self.header, self.slots
+        self.shm.close()
+        self.shm.unlink()
@@ -0,0 +1,121 @@
+"""Record hand landmarks to a compact binary file and replay them without inference.
+
+Usage:
+    python main_improved.py --record-landmarks session.lmk
+    python landmark_recording.py session.lmk [--landmark-filter none] [--quiet]
+
+A recording is an 8-byte magic followed by fixed-size RECORD_DTYPE rows, so
+it can be memory-mapped and replayed straight into the gesture and control
+stages of HandControlCore, skipping the hand model entirely.
+"""
+import argparse
+import time
+import numpy as np
+from landmark_filters import HAND_SLOTS
+
+MAGIC = b"HANDLMK1"
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", np.float64),
+    ("width", np.uint16),
+    ("height", np.uint16),
+    ("present", np.bool_, (len(HAND_SLOTS),)),
+    ("landmarks", np.float32, (len(HAND_SLOTS), 21, 3)),
+])
+
+
+class LandmarkRecorder:
+    """Appends one row per processed frame to a landmark recording"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        # Reused for every row so recording allocates nothing per frame
+        self.row = np.zeros(1, dtype=RECORD_DTYPE)
+        self.frames = 0
+
+    def record(self, timestamp, hands, image_size):
+        """Store {handedness: (21, 3) landmarks} seen at timestamp"""
+        row = self.row[0]
+        row["timestamp"] = timestamp
+        row["width"], row["height"] = image_size
+        row["present"] = False
+        for name, landmarks in hands.items():
+            slot = HAND_SLOTS.get(name)
+            if slot is not None:
+                row["present"][slot] = True
+                row["landmarks"][slot] = landmarks
+        self.file.write(self.row.tobytes())
+        self.frames += 1
+
+    def close(self):
+        self.file.close()
+
+
+def load_recording(path):
+    """Memory-map a recording as a RECORD_DTYPE array"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise IOError(f"Not a landmark recording: {path}")
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=len(MAGIC))
+
+
+def recorded_hands(row):
+    """Rebuild the {handedness: landmarks} dict of one recorded row"""
+    return {name: np.array(row["landmarks"][slot]) for name, slot in HAND_SLOTS.items() if row["present"][slot]}
+
+
+def replay(records, core, realtime=False):
+    """Feed recorded rows through core.update_controls, yielding a result per frame.
+
+    With realtime=True frames are spaced by their recorded timestamps,
+    otherwise they run as fast as the gesture logic allows.
+    """
+    from hand_control import FrameResult
+
+    start = time.perf_counter()
+    first = records[0]["timestamp"] if len(records) else 0
+    for row in records:
+        if realtime:
+            delay = row["timestamp"] - first - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        result = FrameResult(None, float(row["timestamp"]))
+        result.annotated = False
+        core.update_controls(result, recorded_hands(row), (int(row["width"]), int(row["height"])))
+        yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a landmark recording through the gesture logic")
+    parser.add_argument("recording")
+    parser.add_argument("--landmark-filter", choices=["one_euro", "kalman", "none"], default="one_euro")
+    parser.add_argument("--realtime", action="store_true", help="replay at the recorded frame rate")
+    parser.add_argument("--apply-controls", action="store_true", help="also change brightness and volume")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    from hand_control import HandControlCore
+    records = load_recording(args.recording)
+    core = HandControlCore(apply_controls=args.apply_controls, hand_tracking=False,
+                           landmark_filter=args.landmark_filter)
+    frames = 0
+    events = 0
+    start = time.perf_counter()
+    try:
+        for result in replay(records, core, args.realtime):
+            frames += 1
+            for message, _ in result.events:
+                events += 1
+                if not args.quiet:
+                    print(f"[{result.capture_time - records[0]['timestamp']:8.2f}s] {message}")
+    finally:
+        core.close()
+    elapsed = time.perf_counter() - start
+    fps = frames / elapsed if elapsed > 0 else 0
+    print(f"Replayed {frames} frames in {elapsed:.2f}s ({fps:.0f} fps), {events} gesture events, "
+          f"final brightness {core.brightness_value}%, volume {core.volume_value}%")
+
+
+if __name__ == '__main__':
+    main()
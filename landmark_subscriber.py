@@ -0,0 +1,203 @@
+"""Read the hand landmarks and gesture events published by the hand control app.
+
+Usage:
+    python main_improved.py --publish hand_landmarks
+    python landmark_subscriber.py [--name hand_landmarks] [--events-only]
+
+In another program:
+    from landmark_subscriber import LandmarkSubscriber, EventSubscriber
+
+    with LandmarkSubscriber() as landmarks:
+        row = landmarks.latest()
+        if row is not None:
+            hands = landmarks.hands(row)
+
+    for event in EventSubscriber():
+        print(event["hand"], event["event"], event["control"])
+
+Only NumPy is needed; the hand model is never loaded. Reading a frame is
+a copy of one ~560-byte row out of shared memory into a reused buffer, no
+parsing or system calls, and slot() gives direct access without the copy.
+"""
+import argparse
+import json
+import socket
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from landmark_filters import HAND_SLOTS
+from landmark_publisher import DEFAULT_NAME, HEADER_DTYPE, HEADER_SIZE, MAGIC, SLOT_DTYPE, default_socket_path
+
+
+def attach_shared_memory(name):
+    """Open existing shared memory without letting this process unlink it on exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 every attach is tracked, and the tracker would
+        # remove the publisher's memory when this process exits
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class LandmarkSubscriber:
+    """Lock-free reader of the shared landmark ring.
+
+    Raises FileNotFoundError when no publisher with this name is running.
+    Rows are SLOT_DTYPE records; a row whose sequence changed while it was
+    copied was overwritten by the publisher and is read again.
+    """
+    def __init__(self, name=DEFAULT_NAME, retries=4):
+        self.shm = attach_shared_memory(name)
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        if bytes(self.header["magic"]) != MAGIC or self.header["slot_size"] != SLOT_DTYPE.itemsize:
+            self.close()
+            raise IOError(f"Shared memory {name} does not hold a compatible landmark ring")
+        self.capacity = int(self.header["capacity"])
+        self.slots = np.ndarray((self.capacity,), dtype=SLOT_DTYPE, buffer=self.shm.buf, offset=HEADER_SIZE)
+        self.retries = retries
+        self.row = np.zeros(1, dtype=SLOT_DTYPE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def head(self):
+        """Number of frames published so far"""
+        return int(self.header["head"])
+
+    def slot(self, frame):
+        """Zero-copy view of the row for frame; check still_valid(frame) after using it"""
+        return self.slots[frame % self.capacity]
+
+    def still_valid(self, frame):
+        return self.slots[frame % self.capacity]["sequence"] == 2 * frame + 2
+
+    def read(self, frame, out=None):
+        """Copy frame's row into out (a 1-element SLOT_DTYPE array); None if it is gone or not written yet"""
+        out = self.row if out is None else out
+        slot = self.slots[frame % self.capacity:frame % self.capacity + 1]
+        complete = 2 * frame + 2
+        for _ in range(self.retries):
+            if slot["sequence"][0] != complete:
+                if slot["sequence"][0] > complete:
+                    return None
+                # Being written right now
+                continue
+            out[:] = slot
+            if slot["sequence"][0] == complete:
+                return out[0]
+        return None
+
+    def latest(self, out=None):
+        """The newest complete row, or None before the first frame"""
+        for _ in range(self.retries):
+            head = self.head()
+            if head == 0:
+                return None
+            row = self.read(head - 1, out)
+            if row is not None:
+                return row
+        return None
+
+    def wait(self, after, timeout=1.0, poll=0.0002):
+        """Wait until more than `after` frames are published; returns the new head or None on timeout"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            head = self.head()
+            if head > after:
+                return head
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(poll)
+
+    def frames(self, start=None, timeout=1.0):
+        """Yield every row from frame `start` on (default: the next new one), waiting for new frames.
+
+        Frames overwritten before they were read are skipped.
+        """
+        frame = self.head() if start is None else start
+        while True:
+            head = self.wait(frame, timeout)
+            if head is None:
+                return
+            frame = max(frame, head - self.capacity)
+            while frame < head:
+                row = self.read(frame)
+                frame += 1
+                if row is not None:
+                    yield row
+
+    @staticmethod
+    def hands(row):
+        """{handedness: (21, 3) landmarks} of one row"""
+        return {name: np.array(row["landmarks"][slot]) for name, slot in HAND_SLOTS.items() if row["present"][slot]}
+
+    def close(self):
+        self.header = None
+        self.slots = None
+        self.shm.close()
+
+
+class EventSubscriber:
+    """Iterates over the gesture events sent on the publisher's UNIX socket"""
+    def __init__(self, name=DEFAULT_NAME, socket_path=None, timeout=None):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        self.socket.connect(socket_path or default_socket_path(name))
+        self.file = self.socket.makefile("r", encoding="utf-8")
+
+    def __iter__(self):
+        for line in self.file:
+            event = json.loads(line)
+            if event["event"] == "closed":
+                return
+            yield event
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the landmarks and gesture events of a running publisher")
+    parser.add_argument("--name", default=DEFAULT_NAME, help="name given to --publish")
+    parser.add_argument("--socket", help="event socket path (default: NAME.sock in the temp directory)")
+    parser.add_argument("--events-only", action="store_true", help="only print gesture events")
+    args = parser.parse_args(argv)
+
+    if args.events_only:
+        for event in EventSubscriber(args.name, args.socket):
+            print(f"{event['hand']} hand: {event['event']} {event['control'] or ''}", flush=True)
+        return
+
+    landmarks = LandmarkSubscriber(args.name)
+    frames = 0
+    ages = []
+    last_report = time.perf_counter()
+    try:
+        for row in landmarks.frames(timeout=5.0):
+            # Publisher timestamps are perf_counter values at capture time
+            ages.append(time.perf_counter() - row["timestamp"])
+            frames += 1
+            now = time.perf_counter()
+            if now - last_report >= 1.0:
+                hands = ", ".join(LandmarkSubscriber.hands(row)) or "none"
+                print(f"frame {int(row['frame'])}: {frames / (now - last_report):.1f} fps, "
+                      f"capture-to-read {np.median(ages) * 1000:.1f} ms, hands: {hands}, "
+                      f"brightness {int(row['brightness'])}%, volume {int(row['volume'])}%", flush=True)
+                frames = 0
+                ages.clear()
+                last_report = now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        landmarks.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+class LiteHandTracker:
+    """Finds hands with the full hand model and follows them with the lite one.
+
+    Both are MediaPipe Hands instances in tracking mode. full
+    (model_complexity=1) runs until hands are found, then lite
+    (model_complexity=0) takes over and its smaller landmark model runs on
+    every following frame. When lite tracks fewer hands than before, the next
+    frame goes back to full. Every frame runs exactly one of the two.
+    Neither is reset when it takes over, which would cost about as much as a
+    frame. A hand region left over from an earlier turn fails the tracking
+    confidence check and is dropped on the first frame.
+    """
+    def __init__(self, full, lite):
+        self.full = full
+        self.lite = lite
+        self.tracking = False
+        self.tracked_hands = 0
+
+        # Statistics
+        self.full_runs = 0
+        self.lite_runs = 0
+        self.lost = 0
+
+    def process(self, frame):
+        """Same contract as Hands.process"""
+        if not self.tracking:
+            self.full_runs += 1
+            processed = self.full.process(frame)
+            self.tracked_hands = len(processed.multi_hand_landmarks or [])
+            self.tracking = self.tracked_hands > 0
+            return processed
+
+        self.lite_runs += 1
+        processed = self.lite.process(frame)
+        found = len(processed.multi_hand_landmarks or [])
+        if found < self.tracked_hands:
+            # Lost a hand: let the full model pick the hands up again
+            self.lost += 1
+            self.tracking = False
+        self.tracked_hands = found
+        return processed
+
+    def warm_up(self, frame):
+        self.full.process(frame)
+        self.lite.process(frame)
+
+    def close(self):
+        self.full.close()
+        self.lite.close()
+
+    def stats(self):
+        return {"full_runs": self.full_runs, "lite_runs": self.lite_runs, "lost": self.lost}
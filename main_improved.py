@@ -1,18 +1,20 @@
-import cv2
-import numpy as np
-import mediapipe as mp
-import screen_brightness_control as sbc
-from math import hypot
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
+import argparse
+import time
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
 import os
+import threading
+from scheduler import FrameScheduler
+from startup import StartupLoader
+from view_model import ViewModel
+
+# OpenCV, MediaPipe, Pillow and the audio/brightness libraries are imported
+# by the startup phases, after the window is already on screen
 
 class ImprovedHandControlApp:
-    def __init__(self, root):
+    def __init__(self, root, source=None, preview_fps=0, core_options=None, source_options=None,
+                 telemetry_options=None, session_options=None):
+        self.startup = StartupLoader()
         self.root = root
         self.root.title("Advanced Hand Gesture Control System")
         self.root.geometry("1400x900")
@@ -46,94 +48,214 @@ class ImprovedHandControlApp:
         # Create status bar
         self.create_status_bar()
 
-        # Video capture setup
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-
-        # Audio and volume control setup
-        self.devices = AudioUtilities.GetSpeakers()
-        self.interface = self.devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-        self.volume = cast(self.interface, POINTER(IAudioEndpointVolume))
-        volRange = self.volume.GetVolumeRange()
-        self.minVol, self.maxVol, _ = volRange
-
-        # Hand tracking setup with improved parameters
-        self.mpHands = mp.solutions.hands
-        self.hands = self.mpHands.Hands(
-            static_image_mode=False,
-            model_complexity=1,
-            min_detection_confidence=0.8,
-            min_tracking_confidence=0.8,
-            max_num_hands=2)
-
-        self.draw = mp.solutions.drawing_utils
-        self.draw_styles = mp.solutions.drawing_styles
-
-        # Control variables
-        self.brightness_value = 0
-        self.volume_value = 0
-        self.left_hand_detected = False
-        self.right_hand_detected = False
-        
-        # Smoothing variables
-        self.brightness_smooth = 0
-        self.volume_smooth = 0
-        self.smoothing_factor = 0.3
-        
-        # Freeze control variables
-        self.brightness_frozen = False
-        self.volume_frozen = False
-        self.frozen_brightness = 0
-        self.frozen_volume = 0
+        # Widget updates go through a view model that only pushes changes
+        self.create_view_model()
+
+        # Gesture feedback overlay
+        self.create_feedback_overlay()
+
+        # Filled in once the background startup phases finish
+        self.cap = None
+        self.core = None
+        self.actuators = None
+        self.renderer = None
+        self.pipeline = None
+        self.ui_scheduler = None
+        self.first_frame_shown = False
+        self.preview_fps = preview_fps
+
+        # Per-frame timing telemetry is only recorded when requested
+        self.telemetry_options = telemetry_options
+        self.telemetry = None
+        self.create_hud()
+
+        # Annotated session recording, started with --record-session or the S key
+        self.session_options = session_options or {}
+        self.session_recorder = None
 
         # Bind keyboard shortcuts
         self.root.bind('<Key>', self.handle_keypress)
         self.root.focus_set()
-
+        self.video_frame.bind("<Configure>", self.on_video_resize)
+
+        # Show the window right away; the camera (webcam unless another frame
+        # source is given), hand model and output devices come up concurrently
+        self.root.update_idletasks()
+        self.startup.mark("window")
+        self.start_background_startup(source, source_options or {}, dict(core_options or {}))
+        self.check_startup()
+
+    def start_background_startup(self, source, source_options, core_options):
+        """Open the camera, load the hand model and open the output devices in parallel"""
+        def open_camera():
+            if source is not None and not isinstance(source, str):
+                return source
+            from frame_sources import open_source
+            return open_source(source, **source_options)
+
+        controls = None
+        if core_options.get("apply_controls", True):
+            from actuators import create_actuator_service
+            # Devices are opened on the writer thread, which starts immediately
+            self.actuators = create_actuator_service(**(core_options.get("actuator_backends") or {}))
+            core_options["actuators"] = self.actuators
+            controls = self.actuators.ready
+
+        def load_model():
+            from hand_control import HandControlCore
+            core = HandControlCore(**core_options)
+            core.warm_up()
+            return core
+
+        self.startup.run("camera", open_camera)
+        self.startup.run("model", load_model)
+        if controls is not None:
+            self.startup.run("controls", lambda: controls.wait(10))
+
+    def check_startup(self):
+        """Report startup progress in the status bar until every phase is done"""
+        if self.cap is None and "camera" not in self.startup.pending():
+            self.cap = self.startup.result("camera")
+            if getattr(self.cap, "format", None):
+                print("Camera: " + ", ".join(f"{key} {value}" for key, value in self.cap.format.items()))
+        if self.core is None and "model" not in self.startup.pending():
+            self.core = self.startup.result("model")
+
+        errors = self.startup.errors()
+        if errors:
+            name, error = next(iter(errors.items()))
+            self.set_status(f"Startup failed ({name}): {error}")
+            print(f"Startup failed ({name}): {error}")
+            return
+
+        pending = self.startup.pending()
+        if pending:
+            messages = {"camera": "opening camera", "model": "loading hand model",
+                        "controls": "opening brightness/volume controls"}
+            self.set_status("Starting - " + ", ".join(messages[name] for name in pending) + "...")
+            self.root.after(50, self.check_startup)
+            return
+
+        self.start_pipeline()
+
+    def start_pipeline(self):
+        """Start capture, inference and rendering once the camera and model are ready"""
+        from display import DisplayRenderer
+        from pipeline import HandPipeline
+
+        if self.telemetry_options is not None:
+            from telemetry import Telemetry
+            self.telemetry = Telemetry(actuators=self.actuators)
+            if self.telemetry_options.get("dump"):
+                self.telemetry.start_dumps(self.telemetry_options["dump"], self.telemetry_options.get("interval", 10))
+
+        # Capture, inference and rendering run off the Tk thread
+        self.renderer = DisplayRenderer(max_fps=self.preview_fps)
+        width, height = self.video_frame.winfo_width(), self.video_frame.winfo_height()
+        self.renderer.set_target_size(width - 12, height - 12)
+        self.pipeline = HandPipeline(self.cap, self.core.process_frame, self.renderer.render, self.telemetry)
+        self.pipeline.start()
+        self.startup.mark("pipeline")
+        self.set_status("Ready - Place your hands in front of the camera")
+
+        if self.session_options.get("path"):
+            self.start_session_recording(self.session_options["path"])
+
+        # The UI refresh is paced to the source's frame period instead of polling
+        self.ui_scheduler = FrameScheduler(self.pipeline.frame_period)
         self.update_video_feed()
 
-    def check_gesture_controls(self, left_hand_landmarks, right_hand_landmarks):
-        """Check for gesture-based freeze/unfreeze controls"""
-        # Check left hand gestures (for brightness control)
-        if left_hand_landmarks:
-            if self.detect_freeze_gesture(left_hand_landmarks):
-                if not self.brightness_frozen:
-                    self.freeze_brightness()
-                    self.show_gesture_feedback("Left hand: FREEZE BRIGHTNESS", "green")
-            elif self.detect_release_gesture(left_hand_landmarks):
-                if self.brightness_frozen:
-                    self.unfreeze_brightness()
-                    self.show_gesture_feedback("Left hand: RELEASE BRIGHTNESS", "blue")
-            elif self.detect_reset_gesture(left_hand_landmarks):
-                self.reset_controls()
-                self.show_gesture_feedback("Left hand: RESET ALL", "red")
-
-        # Check right hand gestures (for volume control)
-        if right_hand_landmarks:
-            if self.detect_freeze_gesture(right_hand_landmarks):
-                if not self.volume_frozen:
-                    self.freeze_volume()
-                    self.show_gesture_feedback("Right hand: FREEZE VOLUME", "green")
-            elif self.detect_release_gesture(right_hand_landmarks):
-                if self.volume_frozen:
-                    self.unfreeze_volume()
-                    self.show_gesture_feedback("Right hand: RELEASE VOLUME", "blue")
-            elif self.detect_reset_gesture(right_hand_landmarks):
-                self.reset_controls()
-                self.show_gesture_feedback("Right hand: RESET ALL", "red")
+    def create_view_model(self):
+        """Bind UI fields to the widgets that show them"""
+        # Changes are pushed at most at a typical display refresh rate
+        self.view = ViewModel(max_rate=60)
+        self.view.bind("status", lambda text: self.status_label.config(text=text))
+        self.view.bind("brightness_text", lambda text: self.brightness_value_label.config(text=text))
+        self.view.bind("volume_text", lambda text: self.volume_value_label.config(text=text))
+        self.view.bind("brightness_bar", lambda value: self.brightness_bar.config(value=value))
+        self.view.bind("volume_bar", lambda value: self.volume_bar.config(value=value))
+        self.view.bind("freeze_all", lambda text: self.freeze_all_button.config(text=text))
+        self.view.bind("freeze_brightness", lambda text: self.freeze_brightness_button.config(text=text))
+        self.view.bind("freeze_volume", lambda text: self.freeze_volume_button.config(text=text))
+
+    def set_status(self, text):
+        """Show a status message right away"""
+        self.view.set("status", text)
+        self.view.flush(force=True)
+
+    def create_hud(self):
+        """Create the telemetry overlay shown over the video (toggled with H)"""
+        self.hud_label = tk.Label(self.video_frame, text="", justify="left", anchor="nw",
+                                  font=("Consolas", 10), fg="#00ff88", bg="#000000")
+        self.hud_visible = False
+        self.hud_updated = 0
+
+    def toggle_hud(self):
+        if self.telemetry is None:
+            return
+        self.hud_visible = not self.hud_visible
+        if self.hud_visible:
+            self.hud_label.place(x=10, y=10)
+            self.hud_label.lift()
+        else:
+            self.hud_label.place_forget()
+
+    def export_trace(self):
+        """Write the newest frames as a Chrome trace (T key)"""
+        if self.telemetry is None:
+            return
+        path = self.telemetry_options.get("trace") or "hand_control_trace.json"
+        self.telemetry.export_chrome_trace(path)
+        self.show_gesture_feedback(f"Trace written to {path}", "#00ff88")
+
+    def toggle_session_recording(self):
+        """Start or stop recording the annotated video and control timeline (S key)"""
+        if self.pipeline is None:
+            return
+        if self.session_recorder is None:
+            self.start_session_recording()
+        else:
+            self.stop_session_recording()
+
+    def start_session_recording(self, path=None):
+        from session_recording import SessionRecorder, default_session_path
+        path = path or default_session_path(self.session_options.get("directory", "recordings"))
+        fps = 1.0 / self.pipeline.frame_period if self.pipeline.frame_period else 30
+        self.session_recorder = SessionRecorder(path, fps)
+        self.pipeline.recorder = self.session_recorder
+        self.show_gesture_feedback(f"Recording to {path}", "#e94560")
+
+    def stop_session_recording(self):
+        recorder = self.session_recorder
+        self.pipeline.recorder = None
+        self.session_recorder = None
+        # Encoding what is still queued happens off the Tk thread
+        threading.Thread(target=recorder.stop, name="session-recorder-stop", daemon=True).start()
+        stats = recorder.stats()
+        print(f"Session recording {recorder.path}: {stats['accepted']} frames, {stats['dropped']} dropped")
+        self.show_gesture_feedback(f"Recording saved to {recorder.path}", "#00ff88")
+
+    def create_feedback_overlay(self):
+        """Create the single label used for gesture feedback"""
+        self.feedback_label = ttk.Label(self.root, text="",
+                                      font=("Segoe UI", 14, "bold"),
+                                      background="#1a1a2e")
+        self.feedback_job = None
 
     def show_gesture_feedback(self, message, color):
         """Show temporary feedback for gesture detection"""
-        # Create a temporary feedback label
-        feedback_label = ttk.Label(self.root, text=message, 
-                                 font=("Segoe UI", 14, "bold"),
-                                 foreground=color,
-                                 background="#1a1a2e")
-        feedback_label.place(relx=0.5, rely=0.3, anchor="center")
-        
-        # Remove the feedback after 2 seconds
-        self.root.after(2000, feedback_label.destroy)
+        self.feedback_label.config(text=message, foreground=color)
+        self.feedback_label.place(relx=0.5, rely=0.3, anchor="center")
+        self.feedback_label.lift()
+
+        # Remove the feedback 2 seconds after the latest message
+        if self.feedback_job is not None:
+            self.root.after_cancel(self.feedback_job)
+        self.feedback_job = self.root.after(2000, self.hide_gesture_feedback)
+
+    def hide_gesture_feedback(self):
+        self.feedback_job = None
+        self.feedback_label.place_forget()
 
     def setup_styles(self):
         """Setup enhanced ttk styles"""
@@ -216,11 +338,11 @@ class ImprovedHandControlApp:
 
     def create_video_frame(self):
         """Create video display frame"""
-        video_frame = ttk.Frame(self.main_container, style="Video.TFrame")
-        video_frame.grid(row=1, column=0, sticky="nsew", padx=2, pady=2)
+        self.video_frame = ttk.Frame(self.main_container, style="Video.TFrame")
+        self.video_frame.grid(row=1, column=0, sticky="nsew", padx=2, pady=2)
         
-        self.video_label = ttk.Label(video_frame)
-        self.video_label.pack(padx=5, pady=5)
+        self.video_label = ttk.Label(self.video_frame, anchor="center")
+        self.video_label.pack(padx=5, pady=5, expand=True)
 
     def create_control_panel(self):
         """Create enhanced control panel"""
@@ -342,235 +464,137 @@ class ImprovedHandControlApp:
         self.status_label = ttk.Label(status_frame, text="Ready - Place your hands in front of the camera", style="Status.TLabel")
         self.status_label.pack(pady=5)
 
-    def update_video_feed(self):
-        ret, frame = self.cap.read()
-        if ret:
-            frame = cv2.flip(frame, 1)
-            frameRGB = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            processed = self.hands.process(frameRGB)
-
-            left_landmark_list, right_landmark_list, left_hand_landmarks, right_hand_landmarks = self.get_left_right_landmarks(frame, processed)
-
-            # Check for gesture-based controls
-            self.check_gesture_controls(left_hand_landmarks, right_hand_landmarks)
+    def on_video_resize(self, event):
+        """Render the preview at the size actually available for it"""
+        # Leave room for the label padding so the image never forces the frame to grow
+        if self.renderer is not None:
+            self.renderer.set_target_size(event.width - 12, event.height - 12)
 
+    def update_video_feed(self):
+        """Show the newest finished frame and its control values, once per frame period"""
+        self.ui_scheduler.begin()
+        result = self.pipeline.latest()
+        events = self.core.pop_events()
+        for message, color in events:
+            self.show_gesture_feedback(message, color)
+        if events:
+            self.update_freeze_buttons()
+
+        if result is not None:
             # Update status
-            self.update_status(left_landmark_list, right_landmark_list)
-
-            if left_landmark_list and not self.brightness_frozen:
-                left_distance = self.get_distance(frame, left_landmark_list)
-                b_level = np.interp(left_distance, [30, 200], [0, 100])
-                b_level = np.clip(b_level, 0, 100)
-                
-                # Apply smoothing
-                self.brightness_smooth = self.brightness_smooth * (1 - self.smoothing_factor) + b_level * self.smoothing_factor
-                
-                try:
-                    sbc.set_brightness(int(self.brightness_smooth))
-                except Exception as e:
-                    print(f"Error setting brightness: {e}")
-                
-                self.brightness_value = int(self.brightness_smooth)
-                self.brightness_value_label.config(text=f"{self.brightness_value}%")
-                self.brightness_bar['value'] = self.brightness_value
-            elif self.brightness_frozen:
-                # Use frozen value
-                self.brightness_value = self.frozen_brightness
-                self.brightness_value_label.config(text=f"{self.brightness_value}% (FROZEN)")
-                self.brightness_bar['value'] = self.brightness_value
-
-            if right_landmark_list and not self.volume_frozen:
-                right_distance = self.get_distance(frame, right_landmark_list)
-                vol = np.interp(right_distance, [30, 200], [self.minVol, self.maxVol])
-                vol = np.clip(vol, self.minVol, self.maxVol)
-                
-                # Apply smoothing
-                vol_percent = np.interp(vol, [self.minVol, self.maxVol], [0, 100])
-                self.volume_smooth = self.volume_smooth * (1 - self.smoothing_factor) + vol_percent * self.smoothing_factor
-                
-                try:
-                    self.volume.SetMasterVolumeLevel(vol, None)
-                except Exception as e:
-                    print(f"Error setting volume: {e}")
-                
-                self.volume_value = int(self.volume_smooth)
-                self.volume_value_label.config(text=f"{self.volume_value}%")
-                self.volume_bar['value'] = self.volume_value
-            elif self.volume_frozen:
-                # Use frozen value
-                self.volume_value = self.frozen_volume
-                self.volume_value_label.config(text=f"{self.volume_value}% (FROZEN)")
-                self.volume_bar['value'] = self.volume_value
-
-            # Convert image to fit in Tkinter window
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame = Image.fromarray(frame)
-            frame = frame.resize((1200, 900), Image.Resampling.LANCZOS)
-            frame = ImageTk.PhotoImage(frame)
-            self.video_label.img = frame
-            self.video_label.configure(image=frame)
-
-        self.root.after(10, self.update_video_feed)
-
-    def get_left_right_landmarks(self, frame, processed):
-        left_landmark_list = []
-        right_landmark_list = []
-        left_hand_landmarks = None
-        right_hand_landmarks = None
-
-        if processed.multi_hand_landmarks:
-            if processed.multi_handedness:
-                for i, hand_handedness in enumerate(processed.multi_handedness):
-                    handedness = hand_handedness.classification[0].label
-                    landmarks = processed.multi_hand_landmarks[i]
-                    height, width, _ = frame.shape
-                    
-                    if handedness == "Left":
-                        left_hand_landmarks = landmarks
-                        left_landmark_list = [
-                            [idx, int(landmarks.landmark[idx].x * width), int(landmarks.landmark[idx].y * height)]
-                            for idx in [4, 8]  # Thumb tip and index finger tip
-                        ]
-                    elif handedness == "Right":
-                        right_hand_landmarks = landmarks
-                        right_landmark_list = [
-                            [idx, int(landmarks.landmark[idx].x * width), int(landmarks.landmark[idx].y * height)]
-                            for idx in [4, 8]  # Thumb tip and index finger tip
-                        ]
-                    
-                    # Draw hand landmarks with enhanced styling
-                    self.draw.draw_landmarks(
-                        frame, 
-                        landmarks, 
-                        self.mpHands.HAND_CONNECTIONS,
-                        self.draw_styles.get_default_hand_landmarks_style(),
-                        self.draw_styles.get_default_hand_connections_style()
-                    )
-
-        return left_landmark_list, right_landmark_list, left_hand_landmarks, right_hand_landmarks
-
-    def detect_freeze_gesture(self, landmarks):
-        """Detect freeze gesture: closed fist (all fingers closed)"""
-        if landmarks is None:
-            return False
-        
-        # Get finger tip and pip landmarks
-        finger_tips = [8, 12, 16, 20]  # Index, middle, ring, pinky tips
-        finger_pips = [6, 10, 14, 18]  # Index, middle, ring, pinky pips
-        
-        # Check if all fingers are closed (tip below pip)
-        all_closed = True
-        for tip, pip in zip(finger_tips, finger_pips):
-            if landmarks.landmark[tip].y < landmarks.landmark[pip].y:
-                all_closed = False
-                break
-        
-        return all_closed
-
-    def detect_release_gesture(self, landmarks):
-        """Detect release gesture: four fingers extended (index, middle, ring, pinky)"""
-        if landmarks is None:
-            return False
-        
-        # Get finger tip and pip landmarks for four fingers (excluding thumb)
-        finger_tips = [8, 12, 16, 20]  # Index, middle, ring, pinky tips
-        finger_pips = [6, 10, 14, 18]  # Index, middle, ring, pinky pips
-        
-        # Check if exactly four fingers are extended (tip above pip)
-        extended_count = 0
-        for tip, pip in zip(finger_tips, finger_pips):
-            if landmarks.landmark[tip].y < landmarks.landmark[pip].y:
-                extended_count += 1
-        
-        # Check if thumb is closed (thumb tip below thumb pip)
-        thumb_closed = landmarks.landmark[4].y > landmarks.landmark[3].y
-        
-        return extended_count == 4 and thumb_closed
-
-    def detect_reset_gesture(self, landmarks):
-        """Detect reset gesture: thumbs up (thumb extended, others closed)"""
-        if landmarks is None:
-            return False
-        
-        # Check if thumb is extended (thumb tip above thumb pip)
-        thumb_extended = landmarks.landmark[4].y < landmarks.landmark[3].y
-        
-        # Check if other fingers are closed
-        finger_tips = [8, 12, 16, 20]  # Index, middle, ring, pinky tips
-        finger_pips = [6, 10, 14, 18]  # Index, middle, ring, pinky pips
-        
-        others_closed = True
-        for tip, pip in zip(finger_tips, finger_pips):
-            if landmarks.landmark[tip].y < landmarks.landmark[pip].y:
-                others_closed = False
-                break
-        
-        return thumb_extended and others_closed
-
-    def get_distance(self, frame, landmark_list):
-        if len(landmark_list) < 2:
-            return 0
-        (x1, y1), (x2, y2) = (landmark_list[0][1], landmark_list[0][2]), (landmark_list[1][1], landmark_list[1][2])
-        
-        # Draw enhanced circles and line
-        cv2.circle(frame, (x1, y1), 10, (0, 255, 0), cv2.FILLED)
-        cv2.circle(frame, (x1, y1), 15, (0, 255, 0), 2)
-        cv2.circle(frame, (x2, y2), 10, (0, 255, 0), cv2.FILLED)
-        cv2.circle(frame, (x2, y2), 15, (0, 255, 0), 2)
-        cv2.line(frame, (x1, y1), (x2, y2), (0, 255, 0), 3)
-        
-        return hypot(x2 - x1, y2 - y1)
+            self.update_status_text()
+
+            if result.brightness_frozen:
+                self.view.set("brightness_text", f"{result.brightness_value}% (FROZEN)")
+            else:
+                self.view.set("brightness_text", f"{result.brightness_value}%")
+            self.view.set("brightness_bar", result.brightness_value)
+
+            if result.volume_frozen:
+                self.view.set("volume_text", f"{result.volume_value}% (FROZEN)")
+            else:
+                self.view.set("volume_text", f"{result.volume_value}%")
+            self.view.set("volume_bar", result.volume_value)
+
+            if result.display_image is not None:
+                self.renderer.show(self.video_label, result.display_image)
+                if not self.first_frame_shown:
+                    self.first_frame_shown = True
+                    self.startup.mark("first frame")
+                    print(self.startup.report())
+
+            # The preview has been copied into the PhotoImage, so the buffers can be reused
+            result.release()
+
+        # The HUD text only changes a couple of times a second
+        if self.hud_visible and time.perf_counter() - self.hud_updated > 0.5:
+            self.hud_updated = time.perf_counter()
+            self.hud_label.config(text=self.telemetry.hud_text())
+
+        # Only fields that changed since the last push reach Tk
+        self.view.flush()
+
+        self.ui_scheduler.end()
+        delay = int(self.ui_scheduler.time_until_next() * 1000)
+        self.root.after(max(delay, 1), self.update_video_feed)
 
     def update_freeze_buttons(self):
         """Update freeze button text based on current state"""
-        if self.brightness_frozen and self.volume_frozen:
-            self.freeze_all_button.config(text="🔓 Unfreeze All (F)")
+        if self.core.brightness_frozen and self.core.volume_frozen:
+            self.view.set("freeze_all", "🔓 Unfreeze All (F)")
         else:
-            self.freeze_all_button.config(text="🔒 Freeze All (F)")
+            self.view.set("freeze_all", "🔒 Freeze All (F)")
             
-        if self.brightness_frozen:
-            self.freeze_brightness_button.config(text="🔓 Unfreeze Brightness (B)")
+        if self.core.brightness_frozen:
+            self.view.set("freeze_brightness", "🔓 Unfreeze Brightness (B)")
         else:
-            self.freeze_brightness_button.config(text="🔒 Freeze Brightness (B)")
+            self.view.set("freeze_brightness", "🔒 Freeze Brightness (B)")
             
-        if self.volume_frozen:
-            self.freeze_volume_button.config(text="🔓 Unfreeze Volume (V)")
+        if self.core.volume_frozen:
+            self.view.set("freeze_volume", "🔓 Unfreeze Volume (V)")
         else:
-            self.freeze_volume_button.config(text="🔒 Freeze Volume (V)")
+            self.view.set("freeze_volume", "🔒 Freeze Volume (V)")
 
     def update_status_text(self):
         """Update status bar with comprehensive info"""
         status_text = "Ready - "
         
         # Add freeze status
-        if self.brightness_frozen or self.volume_frozen:
+        if self.core.brightness_frozen or self.core.volume_frozen:
             status_text += "🔒 "
-            if self.brightness_frozen:
-                status_text += f"Brightness frozen at {self.frozen_brightness}% "
-            if self.volume_frozen:
-                status_text += f"Volume frozen at {self.frozen_volume}% "
+            if self.core.brightness_frozen:
+                status_text += f"Brightness frozen at {self.core.frozen_brightness}% "
+            if self.core.volume_frozen:
+                status_text += f"Volume frozen at {self.core.frozen_volume}% "
             status_text += "| "
         
         # Add hand detection status
-        if self.left_hand_detected:
-            status_text += "Left hand detected (brightness control) "
-        if self.right_hand_detected:
-            status_text += "Right hand detected (volume control) "
+        for hand, detected in (("Left", self.core.left_hand_detected), ("Right", self.core.right_hand_detected)):
+            if detected:
+                control = self.core.hand_controls.get(hand)
+                label = "pointer" if control == "pointer" else f"{control} control"
+                status_text += f"{hand} hand detected ({label}) "
         
-        if not self.left_hand_detected and not self.right_hand_detected:
-            status_text += "No hands detected - Place your hands in front of the camera"
-        
-        self.status_label.config(text=status_text)
+        if not self.core.left_hand_detected and not self.core.right_hand_detected:
+            if self.core.motion_gate is not None and self.core.motion_gate.idle:
+                status_text += "Idle - Move in front of the camera to wake up"
+            else:
+                status_text += "No hands detected - Place your hands in front of the camera"
 
-    def update_status(self, left_landmarks, right_landmarks):
-        """Update status bar with hand detection info"""
-        self.left_hand_detected = left_landmarks is not None and len(left_landmarks) > 0
-        self.right_hand_detected = right_landmarks is not None and len(right_landmarks) > 0
-        self.update_status_text()
+        if self.session_recorder is not None:
+            status_text += f" | ● REC {self.session_recorder.accepted} frames"
+            if self.session_recorder.dropped:
+                status_text += f", {self.session_recorder.dropped} dropped"
+        
+        self.view.set("status", status_text)
 
     def close(self):
-        self.cap.release()
-        cv2.destroyAllWindows()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            stats = self.pipeline.stats()
+            print(f"Processed {stats['processed']} of {stats['captured']} frames, "
+                  f"{stats['missed_deadlines']} missed deadlines, {stats['skipped_previews']} previews skipped, "
+                  f"{self.ui_scheduler.missed} late UI updates")
+        if self.session_recorder is not None:
+            self.session_recorder.stop()
+            stats = self.session_recorder.stats()
+            print(f"Session recording {self.session_recorder.path}: {stats['encoded']} frames, "
+                  f"{stats['dropped']} dropped")
+        if self.telemetry is not None:
+            self.telemetry.stop_dumps()
+            if self.telemetry_options.get("dump"):
+                self.telemetry.dump(self.telemetry_options["dump"])
+            if self.telemetry_options.get("trace"):
+                self.telemetry.export_chrome_trace(self.telemetry_options["trace"])
+        # Closing during startup only releases what has finished loading
+        if self.cap is not None:
+            self.cap.release()
+        if self.core is not None:
+            self.core.close()
+            if self.core.pointer is not None:
+                print(self.core.pointer.report())
+        if self.actuators is not None:
+            self.actuators.stop()
         self.root.destroy()
 
     def handle_keypress(self, event):
@@ -583,24 +607,39 @@ class ImprovedHandControlApp:
             self.toggle_volume_freeze()
         elif event.char.lower() == 'r':
             self.reset_controls()
+        elif event.char.lower() == 'h':
+            self.toggle_hud()
+        elif event.char.lower() == 't':
+            self.export_trace()
+        elif event.char.lower() == 's':
+            self.toggle_session_recording()
 
     def toggle_freeze(self):
         """Toggle freeze for both brightness and volume"""
-        if self.brightness_frozen and self.volume_frozen:
+        if self.core is None:
+            # Still starting up
+            return
+        if self.core.brightness_frozen and self.core.volume_frozen:
             self.unfreeze_all()
         else:
             self.freeze_all()
 
     def toggle_brightness_freeze(self):
         """Toggle freeze for brightness only"""
-        if self.brightness_frozen:
+        if self.core is None:
+            # Still starting up
+            return
+        if self.core.brightness_frozen:
             self.unfreeze_brightness()
         else:
             self.freeze_brightness()
 
     def toggle_volume_freeze(self):
         """Toggle freeze for volume only"""
-        if self.volume_frozen:
+        if self.core is None:
+            # Still starting up
+            return
+        if self.core.volume_frozen:
             self.unfreeze_volume()
         else:
             self.freeze_volume()
@@ -617,48 +656,211 @@ class ImprovedHandControlApp:
 
     def freeze_brightness(self):
         """Freeze brightness control"""
-        self.brightness_frozen = True
-        self.frozen_brightness = self.brightness_value
+        self.core.freeze_brightness()
         self.update_freeze_buttons()
         self.update_status_text()
+        self.view.flush(force=True)
 
     def unfreeze_brightness(self):
         """Unfreeze brightness control"""
-        self.brightness_frozen = False
+        self.core.unfreeze_brightness()
         self.update_freeze_buttons()
         self.update_status_text()
+        self.view.flush(force=True)
 
     def freeze_volume(self):
         """Freeze volume control"""
-        self.volume_frozen = True
-        self.frozen_volume = self.volume_value
+        self.core.freeze_volume()
         self.update_freeze_buttons()
         self.update_status_text()
+        self.view.flush(force=True)
 
     def unfreeze_volume(self):
         """Unfreeze volume control"""
-        self.volume_frozen = False
+        self.core.unfreeze_volume()
         self.update_freeze_buttons()
         self.update_status_text()
+        self.view.flush(force=True)
 
     def reset_controls(self):
         """Reset both controls to 0"""
-        self.brightness_value = 0
-        self.volume_value = 0
-        self.brightness_smooth = 0
-        self.volume_smooth = 0
-        try:
-            sbc.set_brightness(0)
-            self.volume.SetMasterVolumeLevel(self.minVol, None)
-        except Exception as e:
-            print(f"Error resetting controls: {e}")
+        if self.core is None:
+            # Still starting up
+            return
+        self.core.reset_controls()
         self.update_status_text()
+        self.view.flush(force=True)
 
-def main():
+def main(source=None, preview_fps=0, core_options=None, source_options=None, telemetry_options=None,
+         session_options=None):
     root = tk.Tk()
-    app = ImprovedHandControlApp(root)
+    app = ImprovedHandControlApp(root, source, preview_fps, core_options, source_options, telemetry_options,
+                                 session_options)
     root.protocol("WM_DELETE_WINDOW", app.close)
     root.mainloop()
 
+def main_headless(source, max_frames=0, core_options=None):
+    """Run the full gesture pipeline on a frame source as fast as possible, without Tk"""
+    from hand_control import HandControlCore
+    core_options = dict(core_options or {})
+    core_options.setdefault("apply_controls", False)
+    core = HandControlCore(**core_options)
+    frames = 0
+    hand_frames = 0
+    events = 0
+    start = time.perf_counter()
+    try:
+        while not max_frames or frames < max_frames:
+            ret, frame = source.read()
+            if not ret:
+                if source.exhausted:
+                    break
+                continue
+            # Nothing is displayed, so skip the landmark drawing
+            result = core.process_frame(frame, annotate=False)
+            source.recycle(frame)
+            frames += 1
+            if result is None:
+                continue
+            result.release()
+            if result.left_hand_detected or result.right_hand_detected:
+                hand_frames += 1
+            for message, _ in result.events:
+                events += 1
+                print(f"[frame {frames}] {message}")
+    finally:
+        elapsed = time.perf_counter() - start
+        source.release()
+        core.close()
+
+    fps = frames / elapsed if elapsed > 0 else 0
+    print(f"Processed {frames} frames in {elapsed:.2f}s ({fps:.1f} fps), "
+          f"hands in {hand_frames} frames, {events} gesture events")
+    if core.pointer is not None:
+        print(core.pointer.report())
+    if core.motion_gate is not None:
+        stats = core.motion_gate.stats()
+        print(f"Motion gate: {stats['processed']} inferred, {stats['skipped']} skipped as static, "
+              f"{stats['idle_skipped']} skipped while idle, {stats['wakeups']} wake-ups")
+    if core.lite_tracker is not None:
+        stats = core.lite_tracker.stats()
+        print(f"Inference: {stats['full_runs']} full model, {stats['lite_runs']} lite model, "
+              f"tracking lost {stats['lost']} times")
+    if core.actuators is not None:
+        for name, stats in core.actuators.stats().items():
+            print(f"{name}: {stats['writes']} writes, {stats['failures']} failures, "
+                  f"{stats['dropped']} in deadband, {stats['coalesced']} coalesced, "
+                  f"p95 write {stats['p95_ms']:.2f} ms")
+    return {"frames": frames, "seconds": elapsed, "fps": fps,
+            "hand_frames": hand_frames, "events": events}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hand gesture brightness and volume control")
+    parser.add_argument("--source", default=None,
+                        help="camera index, video file, image directory or 'synthetic' (default: camera 0)")
+    parser.add_argument("--headless", action="store_true",
+                        help="process the source at full speed without a window")
+    parser.add_argument("--apply-controls", action="store_true",
+                        help="in headless mode, also change brightness and volume")
+    parser.add_argument("--max-frames", type=int, default=0,
+                        help="in headless mode, stop after this many frames")
+    parser.add_argument("--loop", action="store_true", help="loop video files and image directories")
+    parser.add_argument("--camera-fps", type=float, default=30, help="frame rate requested from the camera")
+    parser.add_argument("--pixel-format", choices=["MJPG", "YUYV", "auto"], default="MJPG",
+                        help="camera pixel format to request (default: MJPG, falling back to the driver default)")
+    parser.add_argument("--no-grab-thread", action="store_true",
+                        help="read the camera directly instead of draining it on a dedicated thread")
+    parser.add_argument("--preview-fps", type=float, default=0,
+                        help="cap the preview refresh rate without slowing down processing (default: no cap)")
+    parser.add_argument("--lite-tracking", action="store_true",
+                        help="find hands with the full model and track them with the cheaper lite model")
+    parser.add_argument("--landmark-filter", choices=["one_euro", "kalman", "none"], default="one_euro",
+                        help="smoothing applied to hand landmarks (default: one_euro)")
+    parser.add_argument("--predict", action="store_true",
+                        help="extrapolate landmarks by the measured pipeline latency")
+    parser.add_argument("--inference", choices=["hands", "tasks"], default="hands",
+                        help="legacy Hands solution, or the Tasks HandLandmarker running asynchronously (default: hands)")
+    parser.add_argument("--model", default="hand_landmarker.task",
+                        help="HandLandmarker .task model for --inference tasks")
+    parser.add_argument("--delegate", choices=["cpu", "gpu"], default="cpu",
+                        help="where the Tasks model runs (default: cpu)")
+    parser.add_argument("--brightness-backend", choices=["auto", "sbc", "sysfs", "mock"], default="auto",
+                        help="how brightness is set (default: sysfs backlight on Linux if present, else sbc)")
+    parser.add_argument("--volume-backend", choices=["auto", "pycaw", "pulse", "alsa", "mock"], default="auto",
+                        help="how volume is set (default: pycaw on Windows, else PulseAudio or ALSA)")
+    parser.add_argument("--pointer", choices=["left", "right"],
+                        help="move the mouse pointer with this hand's index finger and click by pinching")
+    parser.add_argument("--pointer-sink", choices=["auto", "uinput", "mock"], default="auto",
+                        help="pointer output (default: uinput on Linux)")
+    parser.add_argument("--pointer-rate", type=float, default=240,
+                        help="pointer updates per second, interpolated between camera frames (default: 240)")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="skip hand tracking while the scene is static and no hands were seen recently")
+    parser.add_argument("--idle-after", type=float, default=30,
+                        help="with --motion-gate, seconds without motion before dropping to idle mode (default: 30)")
+    parser.add_argument("--idle-fps", type=float, default=2,
+                        help="with --motion-gate, frames per second checked for motion while idle (default: 2)")
+    parser.add_argument("--record-landmarks", metavar="PATH",
+                        help="save every frame's hand landmarks for replay with landmark_recording.py")
+    parser.add_argument("--publish", metavar="NAME",
+                        help="share landmarks in shared memory NAME and gesture events on a UNIX socket")
+    parser.add_argument("--event-socket", metavar="PATH",
+                        help="with --publish, the gesture event socket (default: NAME.sock in the temp directory)")
+    parser.add_argument("--telemetry", action="store_true",
+                        help="record per-frame timings (H shows the HUD, T writes a Chrome trace)")
+    parser.add_argument("--telemetry-dump", metavar="PATH",
+                        help="periodically append frame timings to a .csv file or write a .json summary")
+    parser.add_argument("--telemetry-interval", type=float, default=10,
+                        help="seconds between telemetry dumps (default: 10)")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of the last frames on exit")
+    parser.add_argument("--record-session", metavar="PATH",
+                        help="record the annotated video (.avi/.mp4) and a control timeline from the start")
+    parser.add_argument("--session-dir", default="recordings",
+                        help="where recordings started with the S key go (default: recordings)")
+    return parser.parse_args(argv)
+
+def telemetry_options_from_args(args):
+    """Telemetry settings, or None when telemetry is off"""
+    if not (args.telemetry or args.telemetry_dump or args.trace):
+        return None
+    return {"dump": args.telemetry_dump, "interval": args.telemetry_interval, "trace": args.trace}
+
+def source_options_from_args(args):
+    """open_source keyword arguments selected on the command line"""
+    return {
+        "loop": args.loop,
+        "camera_options": {
+            "frame_rate": args.camera_fps,
+            "pixel_formats": () if args.pixel_format == "auto" else (args.pixel_format,),
+            "grab_thread": not args.no_grab_thread,
+        },
+    }
+
+def core_options_from_args(args):
+    """HandControlCore keyword arguments selected on the command line"""
+    from pointer_control import pointer_hand_controls
+    return {
+        "lite_tracking": args.lite_tracking,
+        "landmark_filter": args.landmark_filter,
+        "predict_latency": args.predict,
+        "actuator_backends": {"brightness": args.brightness_backend, "volume": args.volume_backend},
+        "record_landmarks": args.record_landmarks,
+        "motion_gate": {"idle_after": args.idle_after, "idle_fps": args.idle_fps} if args.motion_gate else None,
+        "inference": args.inference,
+        "tasks_options": {"model_path": args.model, "delegate": args.delegate},
+        "publish": {"name": args.publish, "socket_path": args.event_socket} if args.publish else None,
+        "hand_controls": pointer_hand_controls(args.pointer),
+        "pointer": {"sink": args.pointer_sink, "rate": args.pointer_rate} if args.pointer else None,
+    }
+
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    args = parse_args()
+    core_options = core_options_from_args(args)
+    if args.headless:
+        from frame_sources import open_source
+        core_options["apply_controls"] = args.apply_controls
+        main_headless(open_source(args.source, **source_options_from_args(args)), args.max_frames, core_options)
+    else:
+        # The source is opened in the background once the window is up
+        main(args.source, args.preview_fps, core_options, source_options_from_args(args),
+             telemetry_options_from_args(args), {"path": args.record_session, "directory": args.session_dir}) 
\ No newline at end of file
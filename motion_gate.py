@@ -0,0 +1,79 @@
+import cv2
+
+
+class MotionGate:
+    """Skips hand inference while nothing in front of the camera moves.
+
+    Every checked frame is shrunk to a small grayscale thumbnail and
+    compared with the thumbnail of the last frame that went through
+    inference. Inference runs when the mean absolute difference exceeds
+    threshold (0-255 scale), while hands were seen or motion happened
+    within the last `hold` seconds, and once per recheck_interval as a
+    safety net. After idle_after seconds without hands or motion the gate
+    goes idle and only looks at idle_fps frames per second, until motion
+    brings it straight back to full rate.
+    """
+    def __init__(self, threshold=4.0, thumb_size=(40, 30), hold=2.0, recheck_interval=1.0,
+                 idle_after=30.0, idle_fps=2.0):
+        self.threshold = threshold
+        self.thumb_size = thumb_size
+        self.hold = hold
+        self.recheck_interval = recheck_interval
+        self.idle_after = idle_after
+        self.idle_period = 1.0 / idle_fps if idle_fps else 0
+        self.reference = None
+        self.last_active = None
+        self.last_check = 0
+        self.last_inference = 0
+        self.idle = False
+
+        # Statistics
+        self.processed = 0
+        self.skipped = 0
+        self.idle_skipped = 0
+        self.wakeups = 0
+
+    def thumbnail(self, frame):
+        small = cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def should_process(self, frame, now):
+        """True if the hand model should run on this BGR frame"""
+        if self.last_active is None:
+            self.last_active = now
+        if self.idle and now - self.last_check < self.idle_period:
+            # Idle: most frames are not even looked at
+            self.idle_skipped += 1
+            return False
+        self.last_check = now
+
+        thumb = self.thumbnail(frame)
+        motion = self.reference is None or cv2.norm(thumb, self.reference, cv2.NORM_L1) / thumb.size > self.threshold
+        if motion:
+            if self.idle:
+                self.wakeups += 1
+            self.last_active = now
+        self.idle = now - self.last_active >= self.idle_after
+
+        recheck = not self.idle and now - self.last_inference >= self.recheck_interval
+        if motion or now - self.last_active < self.hold or recheck:
+            self.reference = thumb
+            self.last_inference = now
+            self.processed += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def hands_seen(self, now):
+        """Tracked hands keep inference running even when they hold still"""
+        self.last_active = now
+        self.idle = False
+
+    def stats(self):
+        return {
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "idle_skipped": self.idle_skipped,
+            "wakeups": self.wakeups,
+            "idle": self.idle,
+        }
@@ -0,0 +1,258 @@
+"""Several camera stations, each with its own hand-tracking process.
+
+Usage:
+    python multi_camera.py --station 0:brightness,volume --station 1:volume,none
+
+Each --station is SOURCE[:LEFT_CONTROL,RIGHT_CONTROL], where a control is
+brightness, volume or none. Frames go to the worker processes and landmarks
+come back through shared memory; only frame numbers and timestamps travel
+over the pipes.
+"""
+import argparse
+import multiprocessing
+import re
+import threading
+import time
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from actuators import create_actuator_service
+from frame_sources import open_source
+from hand_control import FrameResult, HandControlCore
+from landmark_filters import HAND_SLOTS
+from pipeline import CaptureThread, LatestFrameQueue
+
+LANDMARK_SHAPE = (len(HAND_SLOTS), 21, 3)
+
+
+def hand_tracking_worker(frame_name, frame_shape, landmark_name, conn, options):
+    """Worker process: track hands in frames written to shared memory"""
+    import mediapipe as mp
+    from hand_features import landmarks_to_array
+
+    frame_shm = shared_memory.SharedMemory(name=frame_name)
+    landmark_shm = shared_memory.SharedMemory(name=landmark_name)
+    frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=frame_shm.buf)
+    landmarks = np.ndarray(LANDMARK_SHAPE, dtype=np.float32, buffer=landmark_shm.buf)
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        model_complexity=options.get("model_complexity", 1),
+        min_detection_confidence=options.get("min_detection_confidence", 0.8),
+        min_tracking_confidence=options.get("min_tracking_confidence", 0.8),
+        max_num_hands=2)
+
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            sequence, capture_time = message
+            rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+            processed = hands.process(rgb)
+
+            present = [False] * len(HAND_SLOTS)
+            if processed.multi_hand_landmarks and processed.multi_handedness:
+                for i, hand_handedness in enumerate(processed.multi_handedness):
+                    slot = HAND_SLOTS.get(hand_handedness.classification[0].label)
+                    if slot is not None:
+                        landmarks[slot] = landmarks_to_array(processed.multi_hand_landmarks[i])
+                        present[slot] = True
+            conn.send((sequence, capture_time, tuple(present)))
+    finally:
+        hands.close()
+        del frame, landmarks
+        frame_shm.close()
+        landmark_shm.close()
+
+
+class HandTrackingWorker:
+    """Parent-side handle for one hand-tracking process and its shared memory"""
+    def __init__(self, name, frame_shape, options=None):
+        self.name = name
+        self.frame_shape = frame_shape
+        self.frame_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(frame_shape)))
+        self.landmark_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(LANDMARK_SHAPE)) * 4)
+        self.frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=self.frame_shm.buf)
+        self.landmarks = np.ndarray(LANDMARK_SHAPE, dtype=np.float32, buffer=self.landmark_shm.buf)
+        # Spawned rather than forked: this runs on a station thread while the parent
+        # already has capture, actuator and OpenCV threads, and a forked child
+        # can inherit a lock held by one of them
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=hand_tracking_worker, name=f"hands-{name}", daemon=True,
+            args=(self.frame_shm.name, frame_shape, self.landmark_shm.name, child_conn, options or {}))
+        self.busy = False
+
+    def start(self):
+        self.process.start()
+
+    def submit(self, frame, sequence, capture_time):
+        """Copy a frame into shared memory and wake the worker; only call when not busy"""
+        np.copyto(self.frame, frame)
+        self.busy = True
+        self.conn.send((sequence, capture_time))
+
+    def poll(self, timeout):
+        """Return (sequence, capture_time, hands) once the worker is done, else None"""
+        if not self.conn.poll(timeout):
+            return None
+        sequence, capture_time, present = self.conn.recv()
+        hands = {}
+        for name, slot in HAND_SLOTS.items():
+            if present[slot]:
+                hands[name] = self.landmarks[slot].copy()
+        self.busy = False
+        return sequence, capture_time, hands
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(2)
+        if self.process.is_alive():
+            self.process.terminate()
+        del self.frame, self.landmarks
+        for shm in (self.frame_shm, self.landmark_shm):
+            shm.close()
+            shm.unlink()
+
+
+class CameraStation(threading.Thread):
+    """One source with its own worker process and its own control mapping"""
+    def __init__(self, name, source, hand_controls, actuators=None, options=None):
+        super().__init__(name=f"station-{name}", daemon=True)
+        self.station_name = name
+        self.source = source
+        self.options = options or {}
+        self.core = HandControlCore(apply_controls=actuators is not None, hand_tracking=False,
+                                    actuators=actuators, hand_controls=hand_controls,
+                                    landmark_filter=self.options.get("landmark_filter", "one_euro"))
+        # Frames replaced while the worker was busy go back to the source's pool
+        self.frames = LatestFrameQueue(on_drop=lambda item: source.recycle(item[0]))
+        self.capture_thread = CaptureThread(source, self.frames)
+        self.worker = None
+        self.stop_event = threading.Event()
+        self.processed = 0
+        self.sequence = 0
+
+    def run(self):
+        # The first frame fixes the shared memory size for this station
+        item = None
+        self.capture_thread.start()
+        while item is None and not self.stop_event.is_set():
+            item = self.frames.get(timeout=0.1)
+        if item is None:
+            return
+        shape = item[0].shape
+        self.worker = HandTrackingWorker(self.station_name, shape, self.options)
+        self.worker.start()
+
+        while not self.stop_event.is_set():
+            if not self.worker.busy:
+                if item is None:
+                    item = self.frames.get(timeout=0.1)
+                if item is None:
+                    continue
+                frame, capture_time = item
+                item = None
+                self.sequence += 1
+                if frame.shape != shape:
+                    self.worker.submit(cv2.resize(frame, (shape[1], shape[0])), self.sequence, capture_time)
+                else:
+                    self.worker.submit(frame, self.sequence, capture_time)
+                # submit() copied the frame into shared memory
+                self.source.recycle(frame)
+                continue
+
+            done = self.worker.poll(0.1)
+            if done is None:
+                continue
+            _, capture_time, hands = done
+            result = FrameResult(None, capture_time)
+            result.annotated = False
+            self.core.update_controls(result, hands, (shape[1], shape[0]))
+            self.processed += 1
+            for message, _ in result.events:
+                print(f"[{self.station_name}] {message}")
+
+    def stop(self):
+        self.stop_event.set()
+        self.capture_thread.stop()
+        self.join(2)
+        self.capture_thread.join(1)
+        if self.worker is not None:
+            self.worker.stop()
+        self.source.release()
+        self.core.close()
+
+
+def parse_station(spec):
+    """Split SOURCE[:LEFT,RIGHT] into a source spec and a hand -> control mapping"""
+    source, separator, controls = spec.rpartition(":")
+    if not separator or not re.fullmatch(r"[a-z]*,?[a-z]*", controls):
+        return spec, None
+    left, _, right = controls.partition(",")
+    mapping = {}
+    for hand, control in (("Left", left), ("Right", right)):
+        control = control.strip() or "none"
+        if control not in ("brightness", "volume", "none"):
+            raise ValueError(f"Unknown control '{control}' in station {spec}")
+        mapping[hand] = None if control == "none" else control
+    return source, mapping
+
+
+def run_stations(station_specs, apply_controls=True, report_interval=5.0, duration=0, options=None,
+                 actuator_backends=None):
+    """Run every station until interrupted (or for duration seconds)"""
+    actuators = None
+    if apply_controls:
+        # All stations share one actuator writer so device writes stay coalesced
+        actuators = create_actuator_service(**(actuator_backends or {}))
+
+    stations = []
+    for index, spec in enumerate(station_specs):
+        source_spec, mapping = parse_station(spec)
+        stations.append(CameraStation(str(index), open_source(source_spec), mapping, actuators, options))
+    for station in stations:
+        station.start()
+
+    start = time.perf_counter()
+    last = {station.station_name: 0 for station in stations}
+    try:
+        while not duration or time.perf_counter() - start < duration:
+            time.sleep(report_interval)
+            for station in stations:
+                fps = (station.processed - last[station.station_name]) / report_interval
+                last[station.station_name] = station.processed
+                print(f"[{station.station_name}] {fps:.1f} fps, brightness {station.core.brightness_value}%, "
+                      f"volume {station.core.volume_value}%")
+            if all(not station.is_alive() for station in stations):
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for station in stations:
+            station.stop()
+        if actuators is not None:
+            actuators.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hand gesture control with several cameras")
+    parser.add_argument("--station", action="append", required=True,
+                        help="SOURCE[:LEFT_CONTROL,RIGHT_CONTROL], e.g. 0:brightness,volume (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="compute controls without changing them")
+    parser.add_argument("--duration", type=float, default=0, help="stop after this many seconds")
+    parser.add_argument("--model-complexity", type=int, choices=[0, 1], default=1)
+    parser.add_argument("--brightness-backend", choices=["auto", "sbc", "sysfs", "mock"], default="auto")
+    parser.add_argument("--volume-backend", choices=["auto", "pycaw", "pulse", "alsa", "mock"], default="auto")
+    args = parser.parse_args(argv)
+    run_stations(args.station, apply_controls=not args.dry_run, duration=args.duration,
+                 options={"model_complexity": args.model_complexity},
+                 actuator_backends={"brightness": args.brightness_backend, "volume": args.volume_backend})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import deque
+from scheduler import FrameScheduler
+
+
+class LatestFrameQueue:
+    """Bounded queue where new items push out the oldest pending ones.
+
+    on_drop is called with every item pushed out, so pooled buffers held
+    by dropped items go back to their pool.
+    """
+    def __init__(self, maxsize=1, on_drop=None):
+        self.items = deque(maxlen=maxsize)
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+        self.on_drop = on_drop
+
+    def put(self, item):
+        """Add an item, dropping the stalest pending item when full"""
+        stale = None
+        with self.cond:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1
+                stale = self.items[0]
+            self.items.append(item)
+            self.cond.notify()
+        if stale is not None and self.on_drop is not None:
+            self.on_drop(stale)
+
+    def get(self, timeout=None):
+        """Wait for the next item; returns None on timeout or once closed"""
+        with self.cond:
+            if not self.items and not self.closed:
+                self.cond.wait(timeout)
+            if self.items:
+                return self.items.popleft()
+            return None
+
+    def get_nowait(self):
+        """Return the next item or None if nothing is pending"""
+        with self.cond:
+            if self.items:
+                return self.items.popleft()
+            return None
+
+    def close(self):
+        """Wake up any waiting consumer so it can exit"""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+def release_result(result):
+    result.release()
+
+
+class StageThread(threading.Thread):
+    """Worker thread that maps items from one queue into another"""
+    def __init__(self, name, input_queue, output_queue, work):
+        super().__init__(name=name, daemon=True)
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.work = work
+        self.stop_event = threading.Event()
+        self.processed = 0
+
+    def run(self):
+        while not self.stop_event.is_set():
+            item = self.input_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            try:
+                result = self.work(item)
+            except Exception as e:
+                print(f"Error in {self.name} stage: {e}")
+                continue
+            self.processed += 1
+            if result is not None:
+                self.output_queue.put(result)
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class CaptureThread(threading.Thread):
+    """Reads frames from a capture device as fast as it delivers them"""
+    def __init__(self, cap, output_queue):
+        super().__init__(name="capture", daemon=True)
+        self.cap = cap
+        self.output_queue = output_queue
+        self.stop_event = threading.Event()
+        self.captured = 0
+        # Recorded sources are played back at their native rate instead of flat out
+        self.frame_period = 0
+        if not getattr(cap, "live", True) and cap.fps():
+            self.frame_period = 1.0 / cap.fps()
+
+    def run(self):
+        next_time = time.perf_counter()
+        while not self.stop_event.is_set():
+            if self.frame_period:
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                next_time = max(next_time + self.frame_period, time.perf_counter() - self.frame_period)
+            ret, frame = self.cap.read()
+            if not ret:
+                if getattr(self.cap, "exhausted", False):
+                    # Recorded source has no more frames
+                    break
+                # Avoid spinning when the device has nothing to give
+                time.sleep(0.005)
+                continue
+            self.captured += 1
+            # Cameras report when the frame was grabbed, so frame age includes driver queueing
+            capture_time = self.cap.capture_time() if hasattr(self.cap, "capture_time") else time.perf_counter()
+            self.output_queue.put((frame, capture_time))
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class HandPipeline:
+    """Capture -> inference -> render stages connected by latest-frame-wins queues"""
+    def __init__(self, cap, process, render, telemetry=None):
+        # Dropped frames and results hand their pooled buffers back
+        self.cap = cap
+        self.frame_queue = LatestFrameQueue(on_drop=self.recycle_frame)
+        self.result_queue = LatestFrameQueue(on_drop=release_result)
+        self.display_queue = LatestFrameQueue(on_drop=release_result)
+        self.process = process
+        self.render = render
+        # Optional per-frame timing recorder (see telemetry.py)
+        self.telemetry = telemetry
+        # Optional session recorder (see session_recording.py); may be swapped while running
+        self.recorder = None
+
+        # Inference always runs on the newest frame; drawing and preview are
+        # dropped for frames that cannot make their deadline
+        fps = cap.fps() if hasattr(cap, "fps") else 0
+        self.frame_period = 1.0 / fps if fps else 1.0 / 30
+        self.scheduler = FrameScheduler(self.frame_period)
+
+        self.capture_thread = CaptureThread(cap, self.frame_queue)
+        self.inference_thread = StageThread("inference", self.frame_queue, self.result_queue, self.infer)
+        self.render_thread = StageThread("render", self.result_queue, self.display_queue, self.render_preview)
+        self.threads = [self.capture_thread, self.inference_thread, self.render_thread]
+
+    def infer(self, item):
+        frame, capture_time = item
+        self.scheduler.begin(capture_time)
+        annotate = not self.scheduler.skip_optional()
+        try:
+            result = self.process(frame, capture_time, annotate)
+        finally:
+            # The result holds its own RGB copy, so the captured frame can be reused
+            self.recycle_frame(item)
+        recorder = self.recorder
+        if recorder is not None and result is not None:
+            # Every result passes here, also the ones the render stage will drop
+            recorder.submit(result)
+        self.scheduler.end()
+        return result
+
+    def recycle_frame(self, item):
+        if hasattr(self.cap, "recycle"):
+            self.cap.recycle(item[0])
+
+    def render_preview(self, result):
+        if not result.annotated:
+            # Behind schedule: pass the control values on without a preview image
+            if self.telemetry is not None:
+                self.telemetry.record(result, dropped=self.dropped_frames())
+            return result
+        render_start = time.perf_counter()
+        result = self.render(result)
+        render_end = time.perf_counter()
+        # The scheduler counts the preview cost against the next frames' deadlines
+        self.scheduler.record_optional(render_end - render_start)
+        if self.telemetry is not None:
+            self.telemetry.record(result, render_start, render_end, self.dropped_frames())
+        return result
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def latest(self):
+        """Return the newest finished display result, or None"""
+        return self.display_queue.get_nowait()
+
+    def dropped_frames(self):
+        """Total number of stale items discarded between stages"""
+        return self.frame_queue.dropped + self.result_queue.dropped + self.display_queue.dropped
+
+    def stats(self):
+        return {
+            "captured": self.capture_thread.captured,
+            "processed": self.inference_thread.processed,
+            "dropped": self.dropped_frames(),
+            "missed_deadlines": self.scheduler.missed,
+            "skipped_previews": self.scheduler.skipped,
+        }
+
+    def stop(self, timeout=1.0):
+        for thread in self.threads:
+            thread.stop()
+        for queue in (self.frame_queue, self.result_queue, self.display_queue):
+            queue.close()
+        for thread in self.threads:
+            if thread.is_alive():
+                thread.join(timeout)
@@ -0,0 +1,266 @@
+import math
+import sys
+import threading
+import time
+from collections import deque
+import numpy as np
+
+
+class PointerSink:
+    """Base class for pointer output devices driven by the PointerController.
+
+    open() and close() run on the output thread. move() receives an
+    absolute position with x and y in 0-1 (left/top to right/bottom) and
+    button() the new state of the primary button.
+    """
+    def open(self):
+        pass
+
+    def move(self, x, y):
+        raise NotImplementedError
+
+    def button(self, pressed):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class UinputPointer(PointerSink):
+    """Absolute pointer device created through Linux uinput (python-evdev).
+
+    The user needs write access to /dev/uinput (usually through a udev rule
+    or the input group).
+    """
+    RANGE = 65535
+
+    def open(self):
+        from evdev import AbsInfo, UInput, ecodes
+        self.ecodes = ecodes
+        axis = AbsInfo(value=0, min=0, max=self.RANGE, fuzz=0, flat=0, resolution=0)
+        self.device = UInput({
+            ecodes.EV_KEY: [ecodes.BTN_LEFT],
+            ecodes.EV_ABS: [(ecodes.ABS_X, axis), (ecodes.ABS_Y, axis)],
+        }, name="hand-gesture-pointer")
+
+    def move(self, x, y):
+        self.device.write(self.ecodes.EV_ABS, self.ecodes.ABS_X, int(x * self.RANGE))
+        self.device.write(self.ecodes.EV_ABS, self.ecodes.ABS_Y, int(y * self.RANGE))
+        self.device.syn()
+
+    def button(self, pressed):
+        self.device.write(self.ecodes.EV_KEY, self.ecodes.BTN_LEFT, int(pressed))
+        self.device.syn()
+
+    def close(self):
+        self.device.close()
+
+
+class RecordingPointer(PointerSink):
+    """Pointer stand-in that records every update, for tests and runs without an input device"""
+    def __init__(self, history=10000):
+        self.moves = deque(maxlen=history)
+        self.buttons = deque(maxlen=history)
+
+    def move(self, x, y):
+        self.moves.append((time.perf_counter(), x, y))
+
+    def button(self, pressed):
+        self.buttons.append((time.perf_counter(), pressed))
+
+
+POINTER_SINKS = {
+    "uinput": UinputPointer,
+    "mock": RecordingPointer,
+}
+
+
+def default_pointer_sink():
+    if sys.platform.startswith("linux"):
+        return "uinput"
+    print("No pointer output for this platform yet, pointer updates are only recorded")
+    return "mock"
+
+
+class PointerController(threading.Thread):
+    """Moves a pointer from fingertip samples at a higher rate than the camera delivers them.
+
+    update() is called by the control stage with each filtered fingertip
+    position and its capture time. The output thread ticks at `rate` Hz and
+    places the pointer where the fingertip is expected to be now: the last
+    sample moved along the velocity between the last two samples by the time
+    since capture (at most max_extrapolation seconds). This hides both the
+    frame interval and the inference latency. Jumps when a new sample
+    corrects the estimate are spread over about `smoothing` seconds.
+    """
+    def __init__(self, sink, rate=240, max_extrapolation=0.05, smoothing=0.008):
+        super().__init__(name="pointer", daemon=True)
+        self.sink = sink
+        self.period = 1.0 / rate
+        self.max_extrapolation = max_extrapolation
+        self.blend = 1 - math.exp(-self.period / smoothing) if smoothing else 1.0
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        # A new sample wakes the output thread right away instead of at the next tick
+        self.wake = threading.Event()
+        # Set once the sink has been opened (or failed to open)
+        self.ready = threading.Event()
+        self.available = True
+
+        # Latest sample (capture time, position) and the velocity leading up to it
+        self.sample = None
+        self.velocity = np.zeros(2)
+        self.pressed_target = False
+        # Capture and arrival time of the newest sample not yet reflected in the output
+        self.fresh = None
+
+        # Output state (output thread only)
+        self.position = None
+        self.written = None
+        self.pressed = False
+
+        # Statistics
+        self.samples = 0
+        self.updates = 0
+        self.capture_latency = deque(maxlen=1000)
+        self.output_latency = deque(maxlen=1000)
+        self.write_times = deque(maxlen=1000)
+
+    def update(self, position, pressed, capture_time):
+        """Feed one fingertip sample (x, y in 0-1), or None when the hand is gone"""
+        with self.lock:
+            if position is None:
+                self.sample = None
+                self.velocity[:] = 0
+                self.pressed_target = False
+                return
+            position = np.asarray(position, dtype=float)
+            if self.sample is not None and capture_time > self.sample[0]:
+                self.velocity = (position - self.sample[1]) / (capture_time - self.sample[0])
+            else:
+                self.velocity[:] = 0
+            self.sample = (capture_time, position)
+            self.pressed_target = pressed
+            self.fresh = (capture_time, time.perf_counter())
+            self.samples += 1
+        self.wake.set()
+
+    def target(self, sample, velocity, now):
+        """Expected fingertip position at time now"""
+        capture_time, position = sample
+        ahead = min(max(now - capture_time, 0.0), self.max_extrapolation)
+        return np.clip(position + velocity * ahead, 0.0, 1.0)
+
+    def run(self):
+        try:
+            self.sink.open()
+        except Exception as e:
+            self.available = False
+            print(f"Could not open pointer output: {e}")
+        self.ready.set()
+        if not self.available:
+            return
+
+        next_tick = time.perf_counter()
+        while not self.stop_event.is_set():
+            with self.lock:
+                sample, velocity, pressed, fresh = self.sample, self.velocity.copy(), self.pressed_target, self.fresh
+                self.fresh = None
+            self.tick(sample, velocity, pressed, fresh)
+
+            now = time.perf_counter()
+            if next_tick <= now:
+                next_tick += self.period
+                if next_tick <= now:
+                    # Fell behind; do not try to catch up with a burst of updates
+                    next_tick = now + self.period
+            self.wake.wait(next_tick - now)
+            self.wake.clear()
+
+        if self.pressed:
+            self.sink.button(False)
+        self.sink.close()
+
+    def tick(self, sample, velocity, pressed, fresh):
+        if sample is None:
+            self.position = None
+            if self.pressed:
+                self.sink.button(False)
+                self.pressed = False
+            return
+        start = time.perf_counter()
+        target = self.target(sample, velocity, start)
+        if self.position is None:
+            self.position = target
+        else:
+            self.position = self.position + self.blend * (target - self.position)
+        x, y = round(float(self.position[0]), 5), round(float(self.position[1]), 5)
+        if (x, y) == self.written and pressed == self.pressed and fresh is None:
+            # Nothing moved; spare the input stack an identical event
+            return
+        try:
+            self.sink.move(x, y)
+            self.written = (x, y)
+            if pressed != self.pressed:
+                self.sink.button(pressed)
+                self.pressed = pressed
+        except Exception as e:
+            print(f"Error moving pointer: {e}")
+            return
+        end = time.perf_counter()
+        self.updates += 1
+        self.write_times.append(end - start)
+        if fresh is not None:
+            capture_time, arrival = fresh
+            self.capture_latency.append(end - capture_time)
+            self.output_latency.append(end - arrival)
+
+    def stats(self):
+        """Update counts and latency percentiles in milliseconds"""
+        def percentiles(values):
+            if not values:
+                return None, None
+            p50, p95 = np.percentile(np.fromiter(values, dtype=float), [50, 95]) * 1000
+            return float(p50), float(p95)
+
+        stats = {"samples": self.samples, "updates": self.updates}
+        for name, values in (("capture_to_cursor", self.capture_latency),
+                             ("sample_to_cursor", self.output_latency), ("write", self.write_times)):
+            stats[f"{name}_p50_ms"], stats[f"{name}_p95_ms"] = percentiles(values)
+        return stats
+
+    def report(self):
+        stats = self.stats()
+        if stats["sample_to_cursor_p50_ms"] is None:
+            return f"Pointer: {stats['samples']} samples, {stats['updates']} updates"
+        return (f"Pointer: {stats['samples']} samples, {stats['updates']} updates, "
+                f"sample to cursor p50 {stats['sample_to_cursor_p50_ms']:.2f} ms / "
+                f"p95 {stats['sample_to_cursor_p95_ms']:.2f} ms, "
+                f"capture to cursor p50 {stats['capture_to_cursor_p50_ms']:.1f} ms / "
+                f"p95 {stats['capture_to_cursor_p95_ms']:.1f} ms, "
+                f"write p95 {stats['write_p95_ms']:.3f} ms")
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake.set()
+        if self.is_alive():
+            self.join(1.0)
+
+
+def pointer_hand_controls(pointer_hand=None):
+    """HandControlCore hand_controls with the pointer replacing brightness (left) or volume (right)"""
+    hand_controls = {"Left": "brightness", "Right": "volume"}
+    if pointer_hand:
+        hand_controls[pointer_hand.capitalize()] = "pointer"
+    return hand_controls
+
+
+def create_pointer_controller(sink="auto", rate=240):
+    """Start the pointer output thread with a sink picked by name from POINTER_SINKS"""
+    if sink == "auto":
+        sink = default_pointer_sink()
+    if sink not in POINTER_SINKS:
+        raise ValueError(f"Unknown pointer sink: {sink}")
+    controller = PointerController(POINTER_SINKS[sink](), rate)
+    controller.start()
+    return controller
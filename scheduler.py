@@ -0,0 +1,83 @@
+import time
+
+
+class FrameScheduler:
+    """Deadline-based pacing for a loop that should run once per frame period.
+
+    Each iteration gets a deadline: one period after its frame was captured,
+    or the next slot on a fixed grid for loops that are not frame driven. The
+    grid never drifts with load, and when the loop falls more than a period
+    behind it resyncs instead of running catch-up bursts. Optional work such
+    as drawing or preview is skipped when the iteration is predicted to miss
+    its deadline with it: the smoothed duration of recent iterations plus the
+    smoothed cost of the optional work (see record_optional) must fit in the
+    time left. Once skipping, it only resumes with `hysteresis` of a period
+    to spare, so a loop running close to its deadline does not alternate.
+    Until there is an estimate, less than optional_budget of the period left
+    means skip.
+    """
+    def __init__(self, period, optional_budget=0.5, smoothing=0.2, hysteresis=0.1):
+        self.period = period
+        self.optional_budget = optional_budget
+        self.smoothing = smoothing
+        self.hysteresis = hysteresis
+        self.deadline = None
+        self.next_deadline = None
+        self.started = None
+        self.behind = False
+        self.skipping = False
+        # Smoothed seconds per iteration and per run of the optional work
+        self.cost = None
+        self.optional_cost = 0.0
+
+        # Statistics
+        self.iterations = 0
+        self.missed = 0
+        self.skipped = 0
+
+    def begin(self, frame_time=None):
+        """Start an iteration and return its deadline"""
+        now = time.perf_counter()
+        if frame_time is not None:
+            self.deadline = frame_time + self.period
+        else:
+            if self.next_deadline is None or now > self.next_deadline + self.period:
+                self.next_deadline = now + self.period
+            self.deadline = self.next_deadline
+            self.next_deadline += self.period
+        self.started = now
+        self.iterations += 1
+        return self.deadline
+
+    def skip_optional(self):
+        """True when optional work must be dropped to stay on schedule"""
+        remaining = self.deadline - time.perf_counter()
+        if self.cost is None:
+            skip = remaining < self.period * self.optional_budget
+        else:
+            margin = self.period * self.hysteresis if self.skipping else 0.0
+            skip = remaining - self.cost - self.optional_cost < margin
+        self.skipping = skip
+        if skip:
+            self.skipped += 1
+        return skip
+
+    def record_optional(self, duration):
+        """Report how long one run of the optional work took (it may run on another thread)"""
+        self.optional_cost += self.smoothing * (duration - self.optional_cost)
+
+    def end(self):
+        """Finish an iteration; returns True if it missed its deadline"""
+        now = time.perf_counter()
+        duration = now - self.started
+        self.cost = duration if self.cost is None else self.cost + self.smoothing * (duration - self.cost)
+        self.behind = now > self.deadline
+        if self.behind:
+            self.missed += 1
+        return self.behind
+
+    def time_until_next(self):
+        """Seconds until the next grid slot starts"""
+        if self.next_deadline is None:
+            return 0
+        return max(self.next_deadline - self.period - time.perf_counter(), 0)
@@ -0,0 +1,144 @@
+import csv
+import os
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+from buffer_pool import ArrayPool
+
+# Fast, widely playable codecs per container; MJPG keeps the encoder cheap
+CODECS = {".avi": "MJPG", ".mp4": "mp4v", ".mkv": "MJPG"}
+
+TIMELINE_COLUMNS = ["time", "capture_time", "video_frame", "brightness", "volume", "brightness_frozen",
+                    "volume_frozen", "left_hand", "right_hand", "events"]
+
+
+def default_session_path(directory="recordings"):
+    return os.path.join(directory, time.strftime("session-%Y%m%d-%H%M%S.avi"))
+
+
+class SessionRecorder:
+    """Records the annotated frames and a control timeline of a live session.
+
+    submit() runs on the pipeline's inference thread and only copies the
+    frame into a pooled buffer and queues it. A background thread does the
+    color conversion, the value overlay and the encoding. When the bounded
+    queue is full the frame is dropped rather than waited for: the drop is
+    counted, stamped on the next encoded frame and shows as video_frame -1
+    in the timeline. Every submitted result gets a timeline row (PATH with
+    .timeline.csv) with brightness, volume, freeze state and gesture events.
+    """
+    def __init__(self, path, fps=30, queue_size=8):
+        self.path = path
+        self.timeline_path = os.path.splitext(path)[0] + ".timeline.csv"
+        self.fps = fps
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.rows = queue.SimpleQueue()
+        self.pool = ArrayPool()
+        self.bgr = None
+        self.writer = None
+        self.start_time = None
+        self.stopped = False
+        # Makes the stopped check and the enqueue in submit() atomic with respect to stop()
+        self.lock = threading.Lock()
+
+        # Statistics
+        self.accepted = 0
+        self.encoded = 0
+        self.dropped = 0
+
+        self.timeline_file = open(self.timeline_path, "w", newline="")
+        self.timeline = csv.writer(self.timeline_file)
+        self.timeline.writerow(TIMELINE_COLUMNS)
+        self.thread = threading.Thread(target=self.run, name="session-recorder", daemon=True)
+        self.thread.start()
+
+    def submit(self, result):
+        """Queue one frame result for recording; drops the frame rather than wait for the encoder"""
+        with self.lock:
+            if self.stopped:
+                return
+            self.enqueue(result)
+
+    def enqueue(self, result):
+        if self.start_time is None:
+            self.start_time = result.capture_time
+        video_frame = -1
+        if result.frame is not None:
+            if self.frames.full():
+                self.dropped += 1
+            else:
+                buffer = self.pool.acquire(result.frame.shape)
+                np.copyto(buffer, result.frame)
+                video_frame = self.accepted
+                self.accepted += 1
+                self.frames.put_nowait((buffer, result.brightness_value, result.volume_value,
+                                        result.brightness_frozen, result.volume_frozen))
+        self.rows.put((f"{result.capture_time - self.start_time:.3f}", f"{result.capture_time:.6f}", video_frame,
+                       result.brightness_value, result.volume_value, int(result.brightness_frozen),
+                       int(result.volume_frozen), int(result.left_hand_detected), int(result.right_hand_detected),
+                       "; ".join(message for message, _ in result.events)))
+
+    def run(self):
+        while True:
+            try:
+                item = self.frames.get(timeout=0.2)
+            except queue.Empty:
+                item = False
+            self.write_rows()
+            if item is None:
+                break
+            if item:
+                self.encode(*item)
+        self.write_rows()
+
+    def write_rows(self):
+        while True:
+            try:
+                self.timeline.writerow(self.rows.get_nowait())
+            except queue.Empty:
+                return
+
+    def encode(self, frame, brightness, volume, brightness_frozen, volume_frozen):
+        if self.bgr is None or self.bgr.shape != frame.shape:
+            self.bgr = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=self.bgr)
+        self.pool.release(frame)
+        if self.writer is None:
+            self.open_writer(self.bgr.shape[1], self.bgr.shape[0])
+
+        text = f"Brightness {brightness}%{' FROZEN' if brightness_frozen else ''}  " \
+               f"Volume {volume}%{' FROZEN' if volume_frozen else ''}"
+        if self.dropped:
+            text += f"  dropped {self.dropped}"
+        cv2.putText(self.bgr, text, (10, self.bgr.shape[0] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
+                    (0, 0, 0), 3, cv2.LINE_AA)
+        cv2.putText(self.bgr, text, (10, self.bgr.shape[0] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
+                    (255, 255, 255), 1, cv2.LINE_AA)
+        self.writer.write(self.bgr)
+        self.encoded += 1
+
+    def open_writer(self, width, height):
+        codec = CODECS.get(os.path.splitext(self.path)[1].lower(), "MJPG")
+        self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*codec), self.fps, (width, height))
+        if not self.writer.isOpened():
+            print(f"Could not open {self.path} for writing with codec {codec}")
+
+    def stats(self):
+        return {"accepted": self.accepted, "encoded": self.encoded, "dropped": self.dropped}
+
+    def stop(self):
+        """Encode what is queued, then close the video and the timeline"""
+        # The sentinel must be the last item queued. With the queue full, put()
+        # waits for one frame to be encoded, and a racing submit() with it
+        with self.lock:
+            self.stopped = True
+            self.frames.put(None)
+        self.thread.join()
+        if self.writer is not None:
+            self.writer.release()
+        self.timeline_file.close()
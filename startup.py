@@ -0,0 +1,76 @@
+import threading
+import time
+
+
+class StartupPhase:
+    """One piece of startup work running on its own thread"""
+    def __init__(self, name, work):
+        self.name = name
+        self.work = work
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"startup-{name}", daemon=True)
+
+    def run(self):
+        self.started = time.perf_counter()
+        try:
+            self.result = self.work()
+        except Exception as e:
+            self.error = e
+        self.finished = time.perf_counter()
+        self.done.set()
+
+    def seconds(self):
+        if self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class StartupLoader:
+    """Runs independent startup phases concurrently and times each of them.
+
+    Phases are started with run() and polled with pending() from the UI
+    thread, so the window stays responsive while the camera, model and
+    output devices come up. mark() records steps done on the calling thread,
+    such as showing the window or displaying the first frame.
+    """
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.phases = {}
+        self.marks = {}
+
+    def run(self, name, work):
+        phase = StartupPhase(name, work)
+        self.phases[name] = phase
+        phase.thread.start()
+        return phase
+
+    def mark(self, name):
+        """Record how long after startup began a step on the calling thread finished"""
+        self.marks[name] = time.perf_counter() - self.start_time
+
+    def pending(self):
+        """Names of phases still running"""
+        return [name for name, phase in self.phases.items() if not phase.done.is_set()]
+
+    def errors(self):
+        return {name: phase.error for name, phase in self.phases.items() if phase.error is not None}
+
+    def result(self, name):
+        return self.phases[name].result
+
+    def timings(self):
+        """Seconds spent in each phase and seconds from startup to each mark"""
+        return {
+            "phases": {name: phase.seconds() for name, phase in self.phases.items()},
+            "marks": dict(self.marks),
+        }
+
+    def report(self):
+        timings = self.timings()
+        parts = [f"{name} {seconds:.2f}s" for name, seconds in timings["phases"].items() if seconds is not None]
+        parts += [f"{name} at {seconds:.2f}s" for name, seconds in timings["marks"].items()]
+        return "Startup: " + ", ".join(parts)
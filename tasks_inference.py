@@ -0,0 +1,93 @@
+import threading
+import types
+import mediapipe as mp
+
+DEFAULT_MODEL = "hand_landmarker.task"
+
+
+def to_solutions_result(result):
+    """Convert a HandLandmarkerResult to the multi_hand_landmarks/multi_handedness
+    layout of the legacy Hands solution, so landmark extraction and drawing are shared"""
+    from mediapipe.framework.formats import landmark_pb2
+
+    hand_landmarks = []
+    handedness = []
+    for landmarks, categories in zip(result.hand_landmarks, result.handedness):
+        hand_landmarks.append(landmark_pb2.NormalizedLandmarkList(landmark=[
+            landmark_pb2.NormalizedLandmark(x=point.x, y=point.y, z=point.z) for point in landmarks]))
+        handedness.append(types.SimpleNamespace(classification=[
+            types.SimpleNamespace(label=categories[0].category_name, score=categories[0].score)]))
+    return types.SimpleNamespace(multi_hand_landmarks=hand_landmarks or None,
+                                 multi_handedness=handedness or None)
+
+
+class TasksHandTracker:
+    """Asynchronous hand tracking with the MediaPipe Tasks HandLandmarker.
+
+    submit() hands an RGB frame to the landmarker in LIVE_STREAM mode and
+    returns immediately, so the caller can go on capturing while the model
+    runs. on_result(processed, context) is called on MediaPipe's thread
+    with the landmarks and the context given to submit() for that frame.
+    The landmarker drops frames while it is busy and never reports them;
+    their contexts are passed to on_dropped once a newer frame completes.
+    """
+    def __init__(self, on_result, on_dropped=None, model_path=DEFAULT_MODEL, delegate="cpu", num_hands=2,
+                 min_detection_confidence=0.8, min_tracking_confidence=0.8, max_in_flight=2):
+        from mediapipe.tasks.python import BaseOptions
+        from mediapipe.tasks.python import vision
+
+        self.on_result = on_result
+        self.on_dropped = on_dropped
+        self.max_in_flight = max_in_flight
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.last_timestamp = -1
+
+        # Statistics
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+
+        delegates = {"cpu": BaseOptions.Delegate.CPU, "gpu": BaseOptions.Delegate.GPU}
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path, delegate=delegates[delegate]),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self.on_detection)
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def submit(self, rgb, capture_time, context):
+        """Start inference on a frame; returns False if too many frames are in flight"""
+        with self.lock:
+            if len(self.pending) >= self.max_in_flight:
+                self.dropped += 1
+                return False
+            # Timestamps must strictly increase, in milliseconds
+            timestamp = max(int(capture_time * 1000), self.last_timestamp + 1)
+            self.last_timestamp = timestamp
+            self.pending[timestamp] = context
+            self.submitted += 1
+        self.landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb), timestamp)
+        return True
+
+    def on_detection(self, result, output_image, timestamp):
+        with self.lock:
+            context = self.pending.pop(timestamp, None)
+            skipped = [stamp for stamp in self.pending if stamp < timestamp]
+            stale = [self.pending.pop(stamp) for stamp in skipped]
+            self.dropped += len(stale)
+            self.completed += 1
+        if self.on_dropped is not None:
+            for item in stale:
+                self.on_dropped(item)
+        if context is not None:
+            self.on_result(to_solutions_result(result), context)
+
+    def stats(self):
+        return {"submitted": self.submitted, "completed": self.completed, "dropped": self.dropped}
+
+    def close(self):
+        self.landmarker.close()
@@ -0,0 +1,160 @@
+import csv
+import json
+import os
+import threading
+import numpy as np
+
+# One row per frame: stage timestamps in perf_counter seconds (NaN when a stage
+# did not run) plus the actuator backlog and dropped frame count at render time
+FRAME_DTYPE = np.dtype([
+    ("frame", np.int64),
+    ("capture", np.float64),
+    ("inference_start", np.float64),
+    ("inference_end", np.float64),
+    ("controls_end", np.float64),
+    ("render_start", np.float64),
+    ("render_end", np.float64),
+    ("actuator_queue", np.int32),
+    ("dropped", np.int64),
+])
+
+# Durations derived from the timestamps above, as (name, start field, end field)
+STAGES = [
+    ("capture_age", "capture", "inference_start"),
+    ("inference", "inference_start", "inference_end"),
+    ("gestures", "inference_end", "controls_end"),
+    ("render", "render_start", "render_end"),
+]
+
+
+def none_to_nan(value):
+    return np.nan if value is None else value
+
+
+class Telemetry:
+    """Fixed-size ring buffer of per-frame timings.
+
+    record() is called once per finished frame and writes a single
+    preallocated row, so keeping telemetry on costs a few microseconds per
+    frame. When telemetry is off nothing holds a Telemetry object and no
+    rows are written at all.
+    """
+    def __init__(self, capacity=1024, actuators=None):
+        self.rows = np.zeros(capacity, dtype=FRAME_DTYPE)
+        self.count = 0
+        self.actuators = actuators
+        self.lock = threading.Lock()
+        self.dump_thread = None
+        self.dump_stop = threading.Event()
+        self.dumped = 0
+
+    def record(self, result, render_start=None, render_end=None, dropped=0):
+        """Store the timings of one frame result"""
+        queue = self.actuators.queue_depth() if self.actuators is not None else 0
+        with self.lock:
+            row = self.rows[self.count % len(self.rows)]
+            row["frame"] = self.count
+            row["capture"] = result.capture_time
+            row["inference_start"] = none_to_nan(result.inference_start)
+            row["inference_end"] = none_to_nan(result.inference_end)
+            row["controls_end"] = none_to_nan(result.processed_time)
+            row["render_start"] = none_to_nan(render_start)
+            row["render_end"] = none_to_nan(render_end)
+            row["actuator_queue"] = queue
+            row["dropped"] = dropped
+            self.count += 1
+
+    def recent(self, frames=None):
+        """Copy of the newest rows, oldest first"""
+        with self.lock:
+            available = min(self.count, len(self.rows))
+            frames = available if frames is None else min(frames, available)
+            indices = np.arange(self.count - frames, self.count) % len(self.rows)
+            return self.rows[indices]
+
+    def summary(self, frames=None):
+        """fps, per-stage p50/p95 milliseconds, actuator backlog and drops over recent frames"""
+        rows = self.recent(frames)
+        summary = {"frames": int(len(rows)), "fps": 0.0}
+        if len(rows) > 1:
+            span = rows["capture"][-1] - rows["capture"][0]
+            if span > 0:
+                summary["fps"] = float((len(rows) - 1) / span)
+
+        end = np.where(np.isnan(rows["render_end"]), rows["controls_end"], rows["render_end"])
+        stages = [(name, rows[start], rows[stop]) for name, start, stop in STAGES]
+        stages.append(("latency", rows["capture"], end))
+        for name, start, stop in stages:
+            durations = (stop - start) * 1000
+            durations = durations[~np.isnan(durations)]
+            if len(durations):
+                summary[f"{name}_p50_ms"] = float(np.percentile(durations, 50))
+                summary[f"{name}_p95_ms"] = float(np.percentile(durations, 95))
+
+        if len(rows):
+            summary["actuator_queue"] = int(rows["actuator_queue"][-1])
+            summary["dropped"] = int(rows["dropped"][-1])
+        return summary
+
+    def hud_text(self, frames=60):
+        """Short multi-line summary for an on-screen overlay"""
+        s = self.summary(frames)
+        lines = [f"{s['fps']:.1f} fps  latency p95 {s.get('latency_p95_ms', 0):.1f} ms"]
+        for name, _, _ in STAGES:
+            if f"{name}_p50_ms" in s:
+                lines.append(f"{name}: {s[f'{name}_p50_ms']:.1f} / {s[f'{name}_p95_ms']:.1f} ms")
+        lines.append(f"actuator queue {s.get('actuator_queue', 0)}  dropped {s.get('dropped', 0)}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Append rows recorded since the last dump to a CSV file, or write a JSON summary"""
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump(self.summary(), f, indent=2)
+            return
+
+        with self.lock:
+            new_rows = min(self.count - self.dumped, len(self.rows))
+            self.dumped = self.count
+        rows = self.recent(new_rows)
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(FRAME_DTYPE.names)
+            writer.writerows(row.tolist() for row in rows)
+
+    def start_dumps(self, path, interval=10.0):
+        """Dump to path every interval seconds on a background thread"""
+        def run():
+            while not self.dump_stop.wait(interval):
+                self.dump(path)
+        self.dump_thread = threading.Thread(target=run, name="telemetry-dump", daemon=True)
+        self.dump_thread.start()
+
+    def stop_dumps(self):
+        self.dump_stop.set()
+        if self.dump_thread is not None:
+            self.dump_thread.join(1)
+
+    def export_chrome_trace(self, path, frames=300):
+        """Write the newest frames as Chrome trace events (open in chrome://tracing or Perfetto)"""
+        events = []
+        stage_threads = {"capture_age": 1, "inference": 2, "gestures": 2, "render": 3}
+        for row in self.recent(frames):
+            for name, start, stop in STAGES:
+                if np.isnan(row[start]) or np.isnan(row[stop]):
+                    continue
+                events.append({
+                    "name": name, "cat": "frame", "ph": "X", "pid": 1, "tid": stage_threads[name],
+                    "ts": row[start] * 1e6, "dur": (row[stop] - row[start]) * 1e6,
+                    "args": {"frame": int(row["frame"])},
+                })
+            controls_end = row["capture"] if np.isnan(row["controls_end"]) else row["controls_end"]
+            events.append({"name": "actuator_queue", "ph": "C", "pid": 1, "ts": controls_end * 1e6,
+                           "args": {"depth": int(row["actuator_queue"])}})
+        thread_names = {1: "capture", 2: "inference", 3: "render"}
+        for tid, name in thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
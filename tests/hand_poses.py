@@ -0,0 +1,42 @@
+"""Synthetic hand landmarks and a helper that feeds them to HandControlCore"""
+import numpy as np
+from hand_control import FrameResult
+
+IMAGE_SIZE = (640, 480)
+
+
+def hand(thumb_tip, index_tip, fist):
+    """(21, 3) landmarks with the given tips; the other fingers are closed, or all closed for a fist"""
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    landmarks[:, :2] = (0.5, 0.7)
+    landmarks[0, :2] = (0.5, 0.8)      # wrist
+    landmarks[9, :2] = (0.5, 0.6)      # middle finger base: palm is 96 px
+    landmarks[3, :2] = (0.35, 0.55)    # thumb IP joint
+    landmarks[4, :2] = thumb_tip
+    landmarks[6, :2] = (0.5, 0.4)      # index pip
+    landmarks[8, :2] = index_tip
+    for tip, pip in ((12, 10), (16, 14), (20, 18)):
+        landmarks[pip, :2] = (0.5, 0.5)
+        landmarks[tip, :2] = (0.5, 0.65)
+    if fist:
+        landmarks[6, :2] = (0.5, 0.55)
+    return landmarks
+
+
+# Thumb and index far apart: full brightness, no gesture
+OPEN_PINCH = hand((0.3, 0.5), (0.5, 0.3), fist=False)
+# Closed fist with the thumb against the index finger: a near-zero pinch
+FIST = hand((0.45, 0.62), (0.5, 0.62), fist=True)
+# Thumb raised above its IP joint, the other fingers closed
+THUMBS_UP = hand((0.4, 0.35), (0.5, 0.62), fist=True)
+
+
+def feed(core, landmarks, frames, start, handedness="Left", events=None):
+    """Show the same landmarks for frames frames at 30 fps from start; event messages go to events"""
+    for i in range(frames):
+        result = FrameResult(None, start + i / 30)
+        result.annotated = False
+        core.update_controls(result, {handedness: landmarks}, IMAGE_SIZE)
+        if events is not None:
+            events.extend(message for message, _ in result.events)
+    return start + frames / 30
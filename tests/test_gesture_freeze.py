@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("mediapipe")
+pytest.importorskip("cv2")
+
+from hand_control import HandControlCore
+from hand_poses import FIST, OPEN_PINCH, feed
+
+
+def test_freeze_keeps_value_from_before_the_fist():
+    core = HandControlCore(hand_tracking=False, landmark_filter="none",
+                           actuator_backends={"brightness": "mock", "volume": "mock"})
+    device = core.actuators.actuators["brightness"].device
+    try:
+        now = feed(core, OPEN_PINCH, 30, 0.0)
+        before = core.brightness_value
+        assert before > 90
+
+        feed(core, FIST, 5, now)
+        assert core.brightness_frozen
+        assert core.frozen_brightness == before
+        assert core.brightness_value == before
+    finally:
+        core.close()
+    # The fist's own pinch never reached the display; writes are coalesced,
+    # so only check everything from the first write of the held value on
+    levels = [level for _, level in device.values]
+    assert before in levels
+    assert set(levels[levels.index(before):]) == {before}
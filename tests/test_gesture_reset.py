@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("mediapipe")
+pytest.importorskip("cv2")
+
+from hand_control import HandControlCore
+from hand_features import GESTURES, HandFeatures
+from hand_poses import FIST, IMAGE_SIZE, OPEN_PINCH, THUMBS_UP, feed
+
+
+def test_thumbs_up_is_not_a_fist():
+    features = HandFeatures.from_hands([THUMBS_UP, FIST], IMAGE_SIZE)
+    assert GESTURES.evaluate(features) == ["reset", "freeze"]
+
+
+def test_thumbs_up_resets_the_controls():
+    core = HandControlCore(hand_tracking=False, landmark_filter="none",
+                           actuator_backends={"brightness": "mock", "volume": "mock"})
+    events = []
+    try:
+        now = feed(core, OPEN_PINCH, 30, 0.0)
+        assert core.brightness_value > 90
+
+        feed(core, THUMBS_UP, 5, now, events=events)
+    finally:
+        core.close()
+    assert events == ["Left hand: RESET ALL"]
+
+
+def test_held_thumbs_up_resets_once():
+    core = HandControlCore(hand_tracking=False, landmark_filter="none",
+                           actuator_backends={"brightness": "mock", "volume": "mock"})
+    events = []
+    try:
+        now = feed(core, OPEN_PINCH, 30, 0.0)
+        # Four seconds, well past the gesture cooldown
+        feed(core, THUMBS_UP, 120, now, events=events)
+        assert events == ["Left hand: RESET ALL"]
+        assert core.brightness_value == 0
+    finally:
+        core.close()
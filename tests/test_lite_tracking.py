@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from lite_tracking import LiteHandTracker
+
+
+class FakeHands:
+    """Hands stand-in that reports a scripted number of hands per call"""
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.calls = 0
+
+    def process(self, frame):
+        count = self.counts[self.calls]
+        self.calls += 1
+        return SimpleNamespace(multi_hand_landmarks=[object()] * count or None)
+
+
+def test_lite_model_tracks_found_hands_and_full_model_recovers_lost_ones():
+    full = FakeHands([0, 2, 1])
+    lite = FakeHands([2, 2, 1, 1])
+    tracker = LiteHandTracker(full, lite)
+    found = [len(tracker.process(None).multi_hand_landmarks or []) for _ in range(7)]
+
+    # full: nothing, then two hands; lite: tracks both, loses one; full finds one; lite tracks it
+    assert found == [0, 2, 2, 2, 1, 1, 1]
+    assert (full.calls, lite.calls) == (3, 4)
+    assert tracker.stats() == {"full_runs": 3, "lite_runs": 4, "lost": 1}
@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip("mediapipe")
+pytest.importorskip("cv2")
+
+from hand_control import HandControlCore
+from hand_poses import FIST, OPEN_PINCH, THUMBS_UP, feed
+from pointer_control import pointer_hand_controls
+
+
+def test_pointer_hand_ignores_freeze_but_resets():
+    core = HandControlCore(hand_tracking=False, landmark_filter="none",
+                           actuator_backends={"brightness": "mock", "volume": "mock"},
+                           hand_controls=pointer_hand_controls("left"), pointer={"sink": "mock"})
+    events = []
+    try:
+        now = feed(core, OPEN_PINCH, 10, 0.0, events=events)
+        now = feed(core, FIST, 10, now, events=events)
+        assert not core.brightness_frozen
+        now = feed(core, OPEN_PINCH, 10, now, events=events)
+        feed(core, THUMBS_UP, 10, now, events=events)
+    finally:
+        core.close()
+    assert events == ["Left hand: RESET ALL"]
@@ -0,0 +1,52 @@
+import time
+
+MISSING = object()
+
+
+class ViewModel:
+    """UI state that is pushed to Tk widgets only when it changes.
+
+    Each field is bound to a function that applies a value to a widget.
+    set() only records the new value; flush() diffs the recorded values
+    against what was last applied and calls the bindings of the changed
+    fields, at most max_rate times per second unless forced.
+    """
+    def __init__(self, max_rate=60):
+        self.min_interval = 1.0 / max_rate if max_rate else 0
+        self.bindings = {}
+        self.values = {}
+        self.rendered = {}
+        self.last_flush = 0
+
+        # Statistics
+        self.pushes = 0
+        self.flushes = 0
+        self.throttled = 0
+
+    def bind(self, name, apply):
+        """Call apply(value) whenever field name changes"""
+        self.bindings[name] = apply
+
+    def set(self, name, value):
+        self.values[name] = value
+
+    def update(self, **values):
+        self.values.update(values)
+
+    def flush(self, force=False):
+        """Push changed fields to their widgets; returns how many were pushed"""
+        now = time.perf_counter()
+        if not force and now - self.last_flush < self.min_interval:
+            self.throttled += 1
+            return 0
+        self.last_flush = now
+        self.flushes += 1
+
+        pushed = 0
+        for name, value in self.values.items():
+            if self.rendered.get(name, MISSING) != value:
+                self.bindings[name](value)
+                self.rendered[name] = value
+                pushed += 1
+        self.pushes += pushed
+        return pushed